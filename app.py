@@ -1,16 +1,28 @@
+import importlib
 import streamlit as st
-from modules.explorer import page_explorer
 from modules.auth import show_login, show_logout
-from modules.generate import page_generate
-from modules.dashboard import page_dashboard
-from modules.analysis import page_analysis
 from modules.config import t
 
+# Modul halaman (dan dependensi beratnya: seaborn, matplotlib, plotly, docxtpl)
+# baru diimpor saat halaman pertama kali dibuka, agar form login tampil cepat.
+PAGES = {
+    "dashboard": ("modules.dashboard", "page_dashboard"),
+    "generate": ("modules.generate", "page_generate"),
+    "analysis": ("modules.analysis", "page_analysis"),
+    "explorer": ("modules.explorer", "page_explorer"),
+}
+
+def load_page(name):
+    module_name, func_name = PAGES[name]
+    return getattr(importlib.import_module(module_name), func_name)
+
 def check_session_timeout():
     from datetime import datetime, timedelta
     SESSION_TIMEOUT = timedelta(minutes=15)
     if "last_active" in st.session_state:
         if datetime.now() - st.session_state.last_active > SESSION_TIMEOUT:
+            from modules.session_resources import release_session
+            release_session()
             st.session_state.clear()
             st.experimental_rerun()
     st.session_state.last_active = datetime.now()
@@ -39,12 +51,22 @@ def show_main_app():
         ]
     )
 
+    from modules.session_resources import session_memory_report
+    report = session_memory_report()
+    st.sidebar.caption(
+        f"🧠 Memori sesi: {report['session_bytes'] / 2**20:.1f} MB "
+        f"(+ cache analisis {report['memo_bytes'] / 2**20:.1f} MB) · "
+        f"server: {report['total_bytes'] / 2**20:.0f} / {report['budget_bytes'] / 2**20:.0f} MB"
+    )
+
     if page == t("dashboard_title"):
-        page_dashboard()
+        load_page("dashboard")()
     elif page == t("generate_title"):
-        page_generate()
+        load_page("generate")()
+    elif page == t("analysis_title"):
+        load_page("analysis")()
     else:
-        page_analysis()
+        load_page("explorer")()
 
 if __name__ == "__main__":
     if "login_state" not in st.session_state:
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+# Membandingkan ukuran dan waktu arsip ZIP per strategi kompresi
+# untuk N surat dari template sintetis.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strategi arsip ZIP untuk generate surat.")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    from modules.templates import CompiledTemplate
+    from modules.generate import ARCHIVE_STRATEGIES, build_letters_archive
+    from synthetic import make_participants, make_template
+
+    template = CompiledTemplate(make_template(), "bench.docx")
+    df = make_participants(args.rows)
+
+    results = {}
+    for strategy in ARCHIVE_STRATEGIES:
+        start = time.perf_counter()
+        archive, log = build_letters_archive(
+            template, df, "Nama", "Link", strategy=strategy, level=args.level, workers=args.workers
+        )
+        elapsed = time.perf_counter() - start
+        data = archive.getvalue()
+        with zipfile.ZipFile(BytesIO(data)) as zf:
+            bad = zf.testzip()
+            entries = len(zf.infolist())
+        results[strategy] = {
+            "seconds": round(elapsed, 3),
+            "letters_per_s": round(args.rows / elapsed, 1),
+            "size_mb": round(len(data) / 2**20, 3),
+            "entries": entries,
+            "valid": bad is None and entries == args.rows,
+            "failed": sum(1 for item in log if not item["Status"].startswith("✅")),
+        }
+        r = results[strategy]
+        print(f"{strategy:<10} {r['seconds']:>8.2f} s  {r['letters_per_s']:>8.1f} surat/s  "
+              f"{r['size_mb']:>8.2f} MB  valid={r['valid']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"rows": args.rows, "level": args.level, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
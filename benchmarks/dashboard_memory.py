@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Menjalankan page_dashboard berulang kali lewat AppTest (satu run = satu rerun)
+# dan mencatat RSS proses; RSS yang datar berarti tidak ada figure yang menumpuk.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as fh:
+        resident_pages = int(fh.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _dashboard_script():
+    from modules.dashboard import page_dashboard
+    page_dashboard()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memori dashboard over N rerun.")
+    parser.add_argument("--reruns", type=int, default=1000)
+    parser.add_argument("--every", type=int, default=100, help="Interval pencatatan RSS")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ADUANPMT_HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.db"))
+    from streamlit.testing.v1 import AppTest
+    from modules.history import record_batch
+
+    record_batch("bench", [{"Nama": f"Peserta {i}", "Status": "✅ Berhasil" if i % 7 else "❌ Gagal: x"}
+                           for i in range(100)], "bench.docx", 100)
+
+    at = AppTest.from_function(_dashboard_script, default_timeout=30)
+    at.session_state["username"] = "bench"
+    at.session_state["lang"] = "id"
+
+    samples = []
+    start = time.perf_counter()
+    for i in range(1, args.reruns + 1):
+        at.run()
+        if at.exception:
+            raise SystemExit(f"Dashboard error: {at.exception[0].message}")
+        if i == 1 or i % args.every == 0:
+            samples.append({"rerun": i, "rss_mb": round(rss_mb(), 1)})
+            print(f"rerun {i:>6}: RSS {samples[-1]['rss_mb']:.1f} MB")
+    elapsed = time.perf_counter() - start
+
+    growth = samples[-1]["rss_mb"] - samples[0]["rss_mb"]
+    open_figures = None
+    if "matplotlib.pyplot" in sys.modules:
+        open_figures = len(sys.modules["matplotlib.pyplot"].get_fignums())
+
+    result = {
+        "reruns": args.reruns,
+        "ms_per_rerun": round(elapsed / args.reruns * 1000, 2),
+        "rss_growth_mb": round(growth, 1),
+        "open_pyplot_figures": open_figures,
+        "samples": samples,
+    }
+    print(f"{result['ms_per_rerun']} ms/rerun, pertumbuhan RSS {growth:+.1f} MB, figure pyplot terbuka: {open_figures}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+# Pengukuran satu hot path: warmup, lalu N pengulangan untuk latensi (p50/p90/p99)
+# dan throughput; puncak memori diukur terpisah dengan tracemalloc agar overhead
+# tracing tidak ikut masuk ke angka waktu.
+
+
+def measure(fn, repeats: int = 5, warmup: int = 1, items: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    lat_ms = np.array(latencies) * 1000
+    mean_s = float(np.mean(latencies))
+    return {
+        "repeats": repeats,
+        "items": items,
+        "mean_ms": round(float(lat_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 3),
+        "p90_ms": round(float(np.percentile(lat_ms, 90)), 3),
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 3),
+        "items_per_s": round(items / mean_s, 1) if mean_s > 0 else None,
+        "peak_mb": round(peak / 2**20, 3),
+    }
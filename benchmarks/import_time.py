@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Mengukur biaya impor per halaman dengan `python -X importtime` di proses baru,
+# sehingga setiap pengukuran setara dengan cold start satu container.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    # Yang dibutuhkan sebelum form login bisa tampil
+    "login": "import streamlit, modules.auth, modules.config",
+    "dashboard": "import modules.dashboard",
+    "generate": "import modules.generate",
+    "analysis": "import modules.analysis",
+    "explorer": "import modules.explorer",
+}
+
+
+def parse_importtime(stderr: str):
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            # Modul tingkat atas tidak memiliki indentasi tambahan
+            "top_level": not name[1:].startswith(" "),
+        })
+    return entries
+
+
+def measure(stmt: str, runs: int, top: int):
+    walls, totals, entries = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", stmt],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "gagal"}
+        entries = parse_importtime(proc.stderr)
+        totals.append(sum(e["cumulative_us"] for e in entries if e["top_level"]))
+
+    heaviest = sorted((e for e in entries if e["top_level"]), key=lambda e: e["cumulative_us"], reverse=True)
+    return {
+        "wall_ms_median": round(statistics.median(walls) * 1000, 1),
+        "import_ms_median": round(statistics.median(totals) / 1000, 1),
+        "heaviest": [{"module": e["module"], "cumulative_ms": round(e["cumulative_us"] / 1000, 1)} for e in heaviest[:top]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laporan waktu impor per halaman (python -X importtime).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS))
+    args = parser.parse_args()
+
+    results = {name: measure(TARGETS[name], args.runs, args.top) for name in args.targets}
+
+    for name, res in results.items():
+        if "error" in res:
+            print(f"{name:<10} ERROR: {res['error']}")
+            continue
+        print(f"{name:<10} wall {res['wall_ms_median']:>8.1f} ms   import {res['import_ms_median']:>8.1f} ms")
+        for item in res["heaviest"][:5]:
+            print(f"{'':<12}{item['module']:<40}{item['cumulative_ms']:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"python": sys.version, "runs": args.runs, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Uji beban multi-pengguna: N sesi AppTest berjalan bersamaan dalam satu proses,
+# seperti sesi-sesi pada satu server Streamlit (cache_resource, store memori dan
+# database riwayat dipakai bersama). Setiap pengguna virtual menjalankan skenario:
+# login lewat show_login -> unggah data -> geser filter di page_analysis ->
+# pindah tab -> generate satu batch surat. Tingkat konkurensi dinaikkan bertahap
+# untuk menemukan titik jenuh throughput.
+#   python benchmarks/load_test.py --users 1 2 4 8 --output beban.json
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+ARCHIVE_LABEL = "Tanpa kompresi (tercepat)"
+
+
+def _app_script():
+    # Dijalankan oleh AppTest sebagai skrip terpisah (harus mandiri).
+    # AppTest belum bisa mengisi st.file_uploader, jadi unggahan diganti dengan
+    # berkas dari session_state["bench_uploads"] (ekstensi -> (nama, bytes)).
+    from io import BytesIO
+    import streamlit as st
+    from app import check_session_timeout, load_page
+    from modules.auth import show_login
+
+    class _Upload(BytesIO):
+        def __init__(self, name, data):
+            super().__init__(data)
+            self.name = name
+
+    def _file_uploader(label, type=None, **kwargs):
+        uploads = st.session_state.get("bench_uploads", {})
+        for ext in ([type] if isinstance(type, str) else type or []):
+            if ext in uploads:
+                return _Upload(*uploads[ext])
+        return None
+
+    st.file_uploader = _file_uploader
+    if "lang" not in st.session_state:
+        st.session_state.lang = "id"
+    if not st.session_state.get("login_state"):
+        show_login()
+    else:
+        check_session_timeout()
+        load_page(st.session_state.get("bench_page", "dashboard"))()
+
+
+def install_shared_runtime():
+    # AppTest membuat lalu menghapus singleton Runtime di setiap run(); dengan banyak
+    # sesi paralel, run yang selesai lebih dulu menghapus Runtime milik run lain.
+    # Sebagai pengganti server, semua sesi memakai satu Runtime tiruan yang tetap.
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as fh:
+        resident_pages = int(fh.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class ResourceSampler(threading.Thread):
+    # Mencatat RSS dan pemakaian CPU proses (user + system) secara berkala
+    def __init__(self, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.rss = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.rss.append(rss_mb())
+            self._stop_event.wait(self.interval)
+
+    def __enter__(self):
+        self._cpu_start = sum(os.times()[:2])
+        self._wall_start = time.perf_counter()
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_event.set()
+        self.join()
+        self.cpu_seconds = sum(os.times()[:2]) - self._cpu_start
+        self.wall_seconds = time.perf_counter() - self._wall_start
+
+    def summary(self) -> dict:
+        return {
+            "cpu_seconds": round(self.cpu_seconds, 2),
+            # 100% = satu core penuh; Streamlit menjalankan sesi di thread satu proses
+            "cpu_percent": round(self.cpu_seconds / self.wall_seconds * 100, 1),
+            "rss_start_mb": round(self.rss[0], 1) if self.rss else None,
+            "rss_peak_mb": round(max(self.rss), 1) if self.rss else None,
+            "rss_end_mb": round(rss_mb(), 1),
+        }
+
+
+class VirtualUser:
+    def __init__(self, uid: int, data: dict, filter_moves: int, letters: bool, timeout: float):
+        from streamlit.testing.v1 import AppTest
+        self.uid = uid
+        self.data = data
+        self.filter_moves = filter_moves
+        self.letters = letters
+        self.at = AppTest.from_function(_app_script, default_timeout=timeout)
+        self.timings = []
+        self.errors = []
+
+    def _step(self, name: str, action):
+        start = time.perf_counter()
+        try:
+            action()
+            if self.at.exception:
+                self.errors.append(f"{name}: {self.at.exception[0].message}")
+        except Exception as e:
+            self.errors.append(f"{name}: {e!r}")
+        self.timings.append((name, time.perf_counter() - start))
+
+    def _login(self):
+        self.at.run()
+        self.at.text_input[0].input("aku")
+        self.at.text_input[1].input("adalah")
+        self.at.button[0].click().run()
+        # show_login memanggil rerun; pohon elemen AppTest masih memuat widget form
+        # login yang sudah hilang dari session_state, jadi dibangun ulang tanpa
+        # mengirim state widget lama
+        self.at._run()
+
+    def _upload_analysis(self):
+        self.at.session_state["bench_uploads"] = {"csv": ("data.csv", self.data["csv"])}
+        self.at.session_state["bench_page"] = "analysis"
+        self.at.run()
+
+    def _move_filter(self, i: int):
+        widgets = self.at.sidebar.multiselect
+        if not widgets:
+            return self.at.run()
+        widget = widgets[i % len(widgets)]
+        options = list(widget.options)
+        k = 1 + (self.uid + i) % max(len(options) - 1, 1)
+        widget.set_value(options[:k]).run()
+
+    def _switch_tab(self, label: str):
+        self.at.radio(key="analysis_tab").set_value(label).run()
+
+    def _generate(self):
+        self.at.session_state["bench_uploads"] = {
+            "docx": ("surat.docx", self.data["template"]),
+            "xlsx": ("peserta.xlsx", self.data["xlsx"]),
+        }
+        self.at.session_state["bench_page"] = "generate"
+        self.at.session_state["template_source"] = "Unggah Template Baru"
+        self.at.run()
+        # Selectbox ber-format_func hanya bisa dikirim ulang AppTest lewat labelnya,
+        # jadi label diisi lagi sebelum setiap rerun
+        self.at.selectbox(key="archive_strategy").set_value(ARCHIVE_LABEL)
+        from modules.config import t
+        link_box = next(sb for sb in self.at.selectbox if sb.label == t("select_link_col"))
+        link_box.set_value("Link").run()
+        self.at.selectbox(key="archive_strategy").set_value(ARCHIVE_LABEL)
+        self.at.button[0].click().run()
+
+    def scenario(self):
+        self._step("login", self._login)
+        self._step("upload_analysis", self._upload_analysis)
+        for i in range(self.filter_moves):
+            self._step("filter", lambda i=i: self._move_filter(i))
+        self._step("tab_correlation", lambda: self._switch_tab("🔗 Korelasi"))
+        self._step("tab_pivot", lambda: self._switch_tab("🧮 Pivot Table"))
+        if self.letters:
+            self._step("generate", self._generate)
+
+
+def _percentiles(values) -> dict:
+    ms = np.array(values) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p90_ms": round(float(np.percentile(ms, 90)), 1),
+        "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+def run_level(users: int, data_for, args) -> dict:
+    vusers = [VirtualUser(i, data_for(i), args.filter_moves, not args.no_generate, args.timeout) for i in range(users)]
+    barrier = threading.Barrier(users)
+
+    def worker(vu):
+        barrier.wait()
+        vu.scenario()
+
+    threads = [threading.Thread(target=worker, args=(vu,)) for vu in vusers]
+    with ResourceSampler() as sampler:
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+    per_step = {}
+    for vu in vusers:
+        for name, seconds in vu.timings:
+            per_step.setdefault(name, []).append(seconds)
+    interactions = sum(len(v) for v in per_step.values())
+    errors = [e for vu in vusers for e in vu.errors]
+
+    from modules.session_resources import get_store
+    return {
+        "users": users,
+        "wall_seconds": round(sampler.wall_seconds, 2),
+        "interactions": interactions,
+        "throughput_per_s": round(interactions / sampler.wall_seconds, 2),
+        "latency": {name: _percentiles(v) for name, v in per_step.items()},
+        "overall": _percentiles([s for v in per_step.values() for s in v]),
+        "resources": sampler.summary(),
+        "shared_store": get_store().stats(),
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+
+def find_saturation(levels: list, min_gain: float) -> int:
+    # Titik jenuh: tingkat konkurensi terakhir sebelum penambahan pengguna
+    # tidak lagi menaikkan throughput minimal min_gain (relatif)
+    for prev, cur in zip(levels, levels[1:]):
+        if cur["throughput_per_s"] < prev["throughput_per_s"] * (1 + min_gain):
+            return prev["users"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban multi-pengguna aplikasi Streamlit (headless, AppTest).")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8], help="Tingkat konkurensi yang diuji")
+    parser.add_argument("--rows", type=int, default=20_000, help="Baris data analisis per unggahan")
+    parser.add_argument("--letters", type=int, default=20, help="Jumlah surat per batch generate")
+    parser.add_argument("--filter-moves", type=int, default=4)
+    parser.add_argument("--no-generate", action="store_true", help="Lewati langkah generate surat")
+    parser.add_argument("--distinct-data", action="store_true",
+                        help="Setiap pengguna dalam satu tingkat mengunggah data berbeda")
+    parser.add_argument("--min-gain", type=float, default=0.10, help="Kenaikan throughput minimum sebelum dianggap jenuh")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    # Riwayat dan pustaka template di direktori sementara agar data asli tidak tersentuh
+    workdir = tempfile.mkdtemp(prefix="aduanpmt_load_")
+    os.environ.setdefault("ADUANPMT_HISTORY_DB", os.path.join(workdir, "history.db"))
+    os.environ.setdefault("ADUANPMT_TEMPLATE_DIR", os.path.join(workdir, "templates"))
+
+    # Peringatan "missing ScriptRunContext" dari thread pengguna virtual hanya mengotori keluaran
+    logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").disabled = True
+    install_shared_runtime()
+    import synthetic
+    template = synthetic.make_template()
+    xlsx = synthetic.to_xlsx_bytes(synthetic.make_participants(args.letters))
+
+    csv_cache = {}
+
+    def data_for(uid: int) -> dict:
+        # Tanpa --distinct-data semua pengguna mengunggah berkas identik (kasus berbagi cache)
+        seed = uid if args.distinct_data else 0
+        if seed not in csv_cache:
+            csv_cache[seed] = synthetic.to_csv_bytes(synthetic.make_tall_frame(args.rows, seed=seed))
+        return {"template": template, "xlsx": xlsx, "csv": csv_cache[seed]}
+
+    levels = []
+    for users in args.users:
+        level = run_level(users, data_for, args)
+        levels.append(level)
+        print(f"{users:>3} pengguna: {level['throughput_per_s']:>7.2f} interaksi/s  "
+              f"p50 {level['overall']['p50_ms']:>8.1f} ms  p99 {level['overall']['p99_ms']:>8.1f} ms  "
+              f"CPU {level['resources']['cpu_percent']:>6.1f}%  RSS puncak {level['resources']['rss_peak_mb']} MB  "
+              f"error {level['error_count']}")
+        for name, lat in level["latency"].items():
+            print(f"      {name:<18} p50 {lat['p50_ms']:>8.1f} ms  p90 {lat['p90_ms']:>8.1f} ms  p99 {lat['p99_ms']:>8.1f} ms")
+
+    saturation = find_saturation(levels, args.min_gain)
+    if saturation is None:
+        print("Throughput belum jenuh pada tingkat konkurensi yang diuji.")
+    else:
+        print(f"Throughput jenuh pada sekitar {saturation} pengguna bersamaan.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({
+                "rows": args.rows,
+                "letters": args.letters,
+                "filter_moves": args.filter_moves,
+                "distinct_data": args.distinct_data,
+                "cpus": os.cpu_count(),
+                "saturation_users": saturation,
+                "levels": levels,
+            }, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from io import BytesIO
+
+# Suite benchmark hot path aplikasi dengan data sintetis (tanpa jaringan).
+#   python benchmarks/run.py --output hasil.json
+#   python benchmarks/run.py --compare baseline.json hasil.json
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Ukuran data per skala: (surat, baris frame tinggi, (baris, kolom) frame lebar)
+SCALES = {
+    "quick": {"letters": 50, "tall_rows": 20_000, "wide": (5_000, 40)},
+    "default": {"letters": 200, "tall_rows": 200_000, "wide": (20_000, 120)},
+    "large": {"letters": 1_000, "tall_rows": 1_000_000, "wide": (50_000, 300)},
+}
+
+
+def build_cases(scale: dict) -> dict:
+    import numpy as np
+    import pandas as pd
+    import synthetic
+    from modules.correlation import correlation_matrix
+    from modules.explorer import load_csv, load_excel
+    from modules.filters import apply_filters
+    from modules.generate import build_letters_archive
+    from modules.grid import ALL_COLUMNS, _match_mask, _sort_order
+    from modules.streaming import summarize_csv
+    from modules.templates import CompiledTemplate
+
+    template = CompiledTemplate(synthetic.make_template(), "bench.docx")
+    # Satu varian template per wilayah (paragraf berbeda), dirender dalam satu lintasan
+    variants = {
+        region: CompiledTemplate(synthetic.make_template(paragraphs=20 + 5 * i), f"{region}.docx")
+        for i, region in enumerate(synthetic.PROVINSI[:4])
+    }
+    participants = synthetic.make_participants(scale["letters"])
+    tall = synthetic.make_tall_frame(scale["tall_rows"])
+    # Excel jauh lebih lambat dibaca; cukup sepersepuluh baris
+    tall_xlsx = synthetic.to_xlsx_bytes(tall.head(max(scale["tall_rows"] // 10, 1)))
+    tall_csv = synthetic.to_csv_bytes(tall)
+    wide = synthetic.make_wide_frame(*scale["wide"])
+
+    # Filter seperti yang dibentuk halaman explorer: multiselect + slider rentang
+    filters = {
+        "Provinsi": ["Bali", "Jabar", "Jateng", "Jatim"],
+        "Status": ["Selesai", "Proses"],
+        "Jumlah": (20.0, 60.0),
+        "Biaya": (float(tall["Biaya"].quantile(0.05)), float(tall["Biaya"].quantile(0.95))),
+    }
+
+    def legacy_filters():
+        out = tall
+        for col, cond in filters.items():
+            out = out[out[col].isin(cond)] if isinstance(cond, list) else out[out[col].between(*cond)]
+        return out
+
+    def pivot():
+        return pd.pivot_table(tall, index=["Provinsi"], columns=["Kategori"], values=["Jumlah", "Biaya"],
+                              aggfunc="sum", fill_value=0)
+
+    n_letters = len(participants)
+    n_tall = len(tall)
+    return {
+        "generate.letters_store": (lambda: build_letters_archive(template, participants, "Nama", "Link"), n_letters),
+        "generate.letters_parallel": (
+            lambda: build_letters_archive(template, participants, "Nama", "Link", strategy="parallel"), n_letters),
+        "generate.letters_routed": (
+            lambda: build_letters_archive(template, participants, "Nama", "Link", route_col="Wilayah", routes=variants),
+            n_letters),
+        "load.excel": (lambda: load_excel(tall_xlsx), len(tall.head(max(n_tall // 10, 1)))),
+        "load.csv": (lambda: load_csv(tall_csv), n_tall),
+        "filters.apply": (lambda: apply_filters(tall, filters), n_tall),
+        "filters.legacy_loop": (legacy_filters, n_tall),
+        "correlation.block_pearson": (lambda: correlation_matrix(wide, "pearson"), wide.shape[1] ** 2),
+        "correlation.block_spearman": (lambda: correlation_matrix(wide, "spearman"), wide.shape[1] ** 2),
+        "correlation.pandas_pearson": (lambda: wide.corr(method="pearson"), wide.shape[1] ** 2),
+        "pivot.sum": (pivot, n_tall),
+        "grid.sort_index": (lambda: _sort_order(tall["Biaya"], False), n_tall),
+        "grid.search_mask": (lambda: _match_mask(tall, ALL_COLUMNS, "ba"), n_tall),
+        "streaming.summarize_csv": (lambda: summarize_csv(BytesIO(tall_csv)), n_tall),
+    }
+
+
+def run_suite(args) -> dict:
+    scale = SCALES[args.scale]
+    started = time.perf_counter()
+    cases = build_cases(scale)
+    print(f"Data sintetis siap dalam {time.perf_counter() - started:.1f} s (skala {args.scale})")
+
+    from harness import measure
+
+    results = {}
+    for name, (fn, items) in cases.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        r = measure(fn, repeats=args.repeats, warmup=args.warmup, items=items)
+        results[name] = r
+        print(f"{name:<30} p50 {r['p50_ms']:>10.1f} ms  p99 {r['p99_ms']:>10.1f} ms  "
+              f"{r['items_per_s']:>12.1f} item/s  puncak {r['peak_mb']:>8.1f} MB")
+
+    import numpy as np
+    import pandas as pd
+    return {
+        "scale": args.scale,
+        "params": {k: list(v) if isinstance(v, tuple) else v for k, v in scale.items()},
+        "repeats": args.repeats,
+        "created_at": time.time(),
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    with open(current_path, encoding="utf-8") as fh:
+        current = json.load(fh)
+    if baseline.get("scale") != current.get("scale"):
+        print(f"Peringatan: skala berbeda ({baseline.get('scale')} vs {current.get('scale')})")
+
+    regressions = 0
+    print(f"{'hot path':<30} {'p50 lama':>10} {'p50 baru':>10} {'rasio':>7} {'puncak MB':>18}")
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        old = baseline["results"].get(name)
+        new = current["results"].get(name)
+        if old is None or new is None:
+            print(f"{name:<30} {'(hanya di ' + ('baru' if old is None else 'lama') + ')':>30}")
+            continue
+        ratio = new["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠ regresi"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  ✓ lebih cepat"
+        print(f"{name:<30} {old['p50_ms']:>10.1f} {new['p50_ms']:>10.1f} {ratio:>7.2f} "
+              f"{old['peak_mb']:>8.1f} → {new['peak_mb']:<8.1f}{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot path (generate, load, filter, korelasi, pivot).")
+    parser.add_argument("--scale", choices=SCALES, default="default")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", nargs="*", help="Hanya jalankan kasus dengan awalan ini, mis. filters correlation")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Bandingkan dua file hasil; exit 1 jika ada regresi")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Toleransi perubahan p50 (default 10%%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        raise SystemExit(compare(*args.compare, args.threshold))
+
+    result = run_suite(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
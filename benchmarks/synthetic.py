@@ -0,0 +1,69 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+# Generator data sintetis yang deterministik (seed tetap) untuk benchmark:
+# template surat, lembar peserta, serta frame analitik lebar dan tinggi.
+
+PROVINSI = ["Aceh", "Bali", "Banten", "DIY", "Jabar", "Jateng", "Jatim", "Kalbar", "NTB", "Papua", "Riau", "Sulsel"]
+KATEGORI = ["Balita", "Bumil", "Lansia", "Remaja"]
+STATUS = ["Selesai", "Proses", "Ditolak"]
+
+
+def make_template(paragraphs: int = 30) -> bytes:
+    from docx import Document
+    doc = Document()
+    doc.add_paragraph("Kepada Yth. {{ nama_penyelenggara }}")
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Paragraf {i}: " + "Isi surat pemberitahuan kegiatan PMT. " * 4)
+    doc.add_paragraph("Tautan: {{ short_link }} — terima kasih.")
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_participants(rows: int, groups: int = 4) -> pd.DataFrame:
+    # Kolom Wilayah dipakai untuk memilih varian template per grup
+    return pd.DataFrame({
+        "Nama": [f"Peserta {i:06d}" for i in range(rows)],
+        "Link": [f"https://s.id/pmt{i:06d}" for i in range(rows)],
+        "Wilayah": [PROVINSI[i % groups] for i in range(rows)],
+    })
+
+
+def make_tall_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    # Banyak baris, sedikit kolom: bentuk data aduan/penyaluran yang khas
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Provinsi": rng.choice(PROVINSI, rows),
+        "Kategori": rng.choice(KATEGORI, rows),
+        "Status": rng.choice(STATUS, rows, p=[0.6, 0.3, 0.1]),
+        "Tahun": rng.integers(2019, 2025, rows),
+        "Jumlah": rng.poisson(40, rows).astype(float),
+        "Berat_kg": rng.gamma(2.0, 12.5, rows),
+        "Biaya": rng.lognormal(13, 0.6, rows),
+    })
+    # Sebagian kecil nilai hilang, seperti data lapangan
+    df.loc[rng.random(rows) < 0.02, "Berat_kg"] = np.nan
+    return df
+
+
+def make_wide_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    # Banyak kolom numerik berkorelasi (faktor laten) untuk beban korelasi
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((rows, 5))
+    loadings = rng.standard_normal((5, cols))
+    values = factors @ loadings + rng.standard_normal((rows, cols))
+    values[rng.random((rows, cols)) < 0.01] = np.nan
+    return pd.DataFrame(values, columns=[f"x{i:03d}" for i in range(cols)])
+
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def to_xlsx_bytes(df: pd.DataFrame) -> bytes:
+    buf = BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
@@ -6,6 +6,14 @@ import plotly.graph_objects as go
 from io import BytesIO, StringIO
 
 from modules.config import t
+from modules.correlation import correlation_widgets, render_correlation
+from modules.export import export_widgets, render_export
+from modules.filters import apply_filters
+from modules.grid import grid_widgets, render_grid
+from modules.hashing import hash_filters, upload_digest
+from modules.lazy import lazy_tabs, memoize
+from modules.session_resources import shared_object
+from modules.streaming import cached_summary
 
 # Jika ingin seaborn styling untuk Matplotlib juga, tapi di sini kita fokus Plotly
 import seaborn as sns
@@ -21,6 +29,7 @@ def page_analysis():
         st.info(t("upload_first"))
         return
 
+    dataset_key = upload_digest(data_file)
     if data_file.name.endswith(".xlsx"):
         try:
             excel_obj = pd.ExcelFile(data_file)
@@ -31,13 +40,20 @@ def page_analysis():
 
         selected_sheet = st.selectbox("📑 Pilih Sheet untuk Analisis", sheet_names)
         try:
-            df = pd.read_excel(data_file, sheet_name=selected_sheet)
+            dataset_key = f"{dataset_key}:{selected_sheet}"
+            df = shared_object(
+                "analysis_df", dataset_key, lambda: pd.read_excel(data_file, sheet_name=selected_sheet)
+            )
         except Exception as e:
             st.error(f"Error membaca sheet '{selected_sheet}': {e}")
             return
     else:
+        # Mode streaming: file dibaca per chunk, hanya ringkasan yang disimpan
+        if st.sidebar.checkbox("⚡ Mode Streaming (file besar)", key="analysis_streaming"):
+            page_analysis_streaming(data_file, dataset_key)
+            return
         try:
-            df = pd.read_csv(data_file)
+            df = shared_object("analysis_df", dataset_key, lambda: pd.read_csv(data_file))
         except Exception as e:
             st.error(f"Error membaca file CSV: {e}")
             return
@@ -56,10 +72,9 @@ def page_analysis():
                 if vals:
                     selected_filters[col] = vals
 
-    # Terapkan filter
-    df_filtered = df.copy()
-    for col, vals in selected_filters.items():
-        df_filtered = df_filtered[df_filtered[col].isin(vals)]
+    # Terapkan filter (df dipakai bersama antar sesi, jadi tidak diubah in-place)
+    df_filtered = apply_filters(df, selected_filters)
+    filter_key = hash_filters(selected_filters)
 
     # ----- Hitung statistik dasar sekali (digunakan di banyak tab) -----
     total_rows = len(df_filtered)
@@ -67,27 +82,42 @@ def page_analysis():
     num_cols = df_filtered.select_dtypes(include=[np.number]).columns.tolist()
     cat_cols = df_filtered.select_dtypes(include=["object", "category"]).columns.tolist()
 
+    data_key = (dataset_key, filter_key)
+
     # Missing values summary
-    missing_count = df_filtered.isnull().sum()
-    missing_pct = (missing_count / total_rows * 100).round(2)
-    df_missing = pd.DataFrame({
-        "Kolom": df_filtered.columns,
-        "Missing Count": missing_count.values,
-        "Missing (%)": missing_pct.values
-    }).sort_values(by="Missing (%)", ascending=False)
+    def _missing_summary():
+        missing_count = df_filtered.isnull().sum()
+        missing_pct = (missing_count / total_rows * 100).round(2)
+        return pd.DataFrame({
+            "Kolom": df_filtered.columns,
+            "Missing Count": missing_count.values,
+            "Missing (%)": missing_pct.values
+        }).sort_values(by="Missing (%)", ascending=False)
 
     # ----- Tab Layout (mirip page di Power BI) -----
-    tabs = st.tabs([
+    # Hanya tab yang sedang dilihat yang dihitung; hasilnya disimpan di memo
+    tab_labels = [
         "📋 Overview",
         "🔍 Missing Values",
         "🔗 Korelasi",
         "📈 Distribusi Numerik",
         "📊 Distribusi Kategorikal",
         "🧮 Pivot Table"
-    ])
+    ]
+    all_columns = df_filtered.columns.tolist()
+    # Widget di tiap tab (pilihan sah atau None) agar pengaturannya tetap ada saat tab berganti
+    tab_widgets = {
+        tab_labels[0]: {**grid_widgets("analysis_grid", all_columns), **export_widgets("analysis_export")},
+        tab_labels[2]: correlation_widgets("analysis_corr"),
+        tab_labels[3]: {"dist_num": num_cols, "dist_bins": None},
+        tab_labels[4]: {"dist_cat": cat_cols, "dist_topn": None},
+        tab_labels[5]: {"pivot_idx": all_columns, "pivot_cols": all_columns, "pivot_vals": num_cols, "pivot_agg": None},
+    }
+    active_tab = lazy_tabs(tab_labels, key="analysis_tab", widgets=tab_widgets)
 
     # -------------------- Tab 1: Overview --------------------
-    with tabs[0]:
+    if active_tab == tab_labels[0]:
+        df_missing = memoize("analysis_missing", data_key, _missing_summary)
         st.subheader("📋 Ringkasan Data")
         col1, col2, col3 = st.columns(3)
         col1.metric("Total Baris", total_rows)
@@ -99,20 +129,16 @@ def page_analysis():
         col5.metric("Kolom Hilang (>0%)", (df_missing["Missing (%)"] > 0).sum())
 
         st.markdown("---")
-        st.subheader("🔎 Preview Data (10 Baris Pertama)")
-        st.dataframe(df_filtered.head(10), use_container_width=True)
-
-        # Tombol unduh seluruh data yang sudah difilter
-        csv_all = df_filtered.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "⬇️ Unduh Semua Data (CSV)",
-            data=csv_all,
-            file_name="data_filtered.csv",
-            mime="text/csv",
-        )
+        st.subheader("🔎 Preview Data")
+        render_grid(df_filtered, key="analysis_grid", data_key=data_key)
+
+        # Unduh seluruh data yang sudah difilter (dibuat hanya saat diminta)
+        st.markdown("**⬇️ Unduh Semua Data**")
+        render_export(df_filtered, dataset_key, filter_key, key="analysis_export")
 
     # -------------------- Tab 2: Missing Values --------------------
-    with tabs[1]:
+    elif active_tab == tab_labels[1]:
+        df_missing = memoize("analysis_missing", data_key, _missing_summary)
         st.subheader("🚨 Analisis Nilai Hilang")
         st.dataframe(df_missing, use_container_width=True)
 
@@ -134,33 +160,21 @@ def page_analysis():
             st.info("Tidak ada nilai hilang pada data.")
 
     # -------------------- Tab 3: Korelasi --------------------
-    with tabs[2]:
+    elif active_tab == tab_labels[2]:
         st.subheader("🔗 Korelasi Kolom Numerik")
         if len(num_cols) >= 2:
-            corr = df_filtered[num_cols].corr()
-
-            st.dataframe(corr.round(2), use_container_width=True)
-
-            fig_corr = px.imshow(
-                corr,
-                text_auto=".2f",
-                aspect="auto",
-                color_continuous_scale="RdBu_r",
-                title="Heatmap Korelasi Numerik",
-            )
-            fig_corr.update_layout(height=500)
-            st.plotly_chart(fig_corr, use_container_width=True)
+            render_correlation(df_filtered, num_cols, dataset_key, filter_key, key="analysis_corr")
         else:
             st.info("Data tidak memiliki cukup kolom numerik untuk korelasi.")
 
     # -------------------- Tab 4: Distribusi Numerik --------------------
-    with tabs[3]:
+    elif active_tab == tab_labels[3]:
         st.subheader("📈 Distribusi Kolom Numerik")
         if num_cols:
             col_num = st.selectbox("🏷️ Pilih Kolom Numerik", num_cols, key="dist_num")
             bins = st.slider("Jumlah Bin Histogram", min_value=5, max_value=100, value=30, key="dist_bins")
 
-            col_data = df_filtered[col_num].dropna()
+            col_data = memoize("analysis_col", data_key + (col_num,), lambda: df_filtered[col_num].dropna())
             if not col_data.empty:
                 # Histogram interaktif
                 fig_hist = px.histogram(
@@ -181,12 +195,15 @@ def page_analysis():
                 st.plotly_chart(fig_box, use_container_width=True)
 
                 # Outlier (IQR)
-                Q1 = col_data.quantile(0.25)
-                Q3 = col_data.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outliers = col_data[(col_data < lower_bound) | (col_data > upper_bound)]
+                def _outliers():
+                    Q1 = col_data.quantile(0.25)
+                    Q3 = col_data.quantile(0.75)
+                    IQR = Q3 - Q1
+                    lower = Q1 - 1.5 * IQR
+                    upper = Q3 + 1.5 * IQR
+                    return lower, upper, col_data[(col_data < lower) | (col_data > upper)]
+
+                lower_bound, upper_bound, outliers = memoize("analysis_outliers", data_key + (col_num,), _outliers)
                 st.markdown(
                     f"**Outlier (Nilai < {lower_bound:.2f} atau > {upper_bound:.2f}):** "
                     f"{len(outliers)} nilai"
@@ -199,14 +216,16 @@ def page_analysis():
             st.info("Tidak ada kolom numerik untuk distribusi.")
 
     # -------------------- Tab 5: Distribusi Kategorikal --------------------
-    with tabs[4]:
+    elif active_tab == tab_labels[4]:
         st.subheader("📊 Distribusi Kolom Kategorikal")
         if cat_cols:
             col_cat = st.selectbox("🏷️ Pilih Kolom Kategorikal", cat_cols, key="dist_cat")
             top_n = st.slider(
                 "Tampilkan Top N Kategori Teratas", min_value=1, max_value=20, value=5, key="dist_topn"
             )
-            value_counts = df_filtered[col_cat].value_counts(dropna=False).head(top_n)
+            value_counts = memoize(
+                "analysis_vc", data_key + (col_cat,), lambda: df_filtered[col_cat].value_counts(dropna=False)
+            ).head(top_n)
             df_cat = pd.DataFrame({col_cat: value_counts.index, "Count": value_counts.values})
             st.dataframe(df_cat, use_container_width=True)
 
@@ -226,9 +245,8 @@ def page_analysis():
             st.info("Tidak ada kolom kategorikal untuk dianalisa.")
 
     # -------------------- Tab 6: Pivot Table --------------------
-    with tabs[5]:
+    elif active_tab == tab_labels[5]:
         st.subheader("🧮 Pivot Table")
-        all_columns = df_filtered.columns.tolist()
 
         idx_cols = st.multiselect(
             "📂 Pilih Kolom untuk Index (Baris)", all_columns, default=all_columns[:1], key="pivot_idx"
@@ -252,13 +270,17 @@ def page_analysis():
 
         if idx_cols and col_pivot and val_cols:
             try:
-                pivot_df = pd.pivot_table(
-                    df_filtered,
-                    index=idx_cols,
-                    columns=col_pivot,
-                    values=val_cols,
-                    aggfunc=aggfunc,
-                    fill_value=0,
+                pivot_df = memoize(
+                    "analysis_pivot",
+                    data_key + (tuple(idx_cols), tuple(col_pivot), tuple(val_cols), aggfunc),
+                    lambda: pd.pivot_table(
+                        df_filtered,
+                        index=idx_cols,
+                        columns=col_pivot,
+                        values=val_cols,
+                        aggfunc=aggfunc,
+                        fill_value=0,
+                    ),
                 )
                 st.dataframe(pivot_df, use_container_width=True)
 
@@ -296,3 +318,171 @@ def page_analysis():
     # -------------------- Footer Akhir --------------------
     st.markdown("---")
     st.caption("✅ Analisa Data Lengkap (Power BI-Style) Selesai.")
+
+
+def page_analysis_streaming(data_file, dataset_key):
+    with st.spinner("Membaca file secara bertahap…"):
+        base_summary = cached_summary(dataset_key, hash_filters({}), data_file, {})
+
+    # ----- Sidebar Filters (kategori diambil dari ringkasan, bukan dari data penuh) -----
+    st.sidebar.markdown("## 🔍 Filter Data")
+    with st.sidebar.expander("Filter Baris:"):
+        selected_filters = {}
+        for col, state in base_summary.columns.items():
+            if 0 < state.distinct.estimate() <= 10 and state.top.error == 0:
+                vals = st.sidebar.multiselect(
+                    f"{col}", options=list(state.top.counts.keys()), default=None
+                )
+                if vals:
+                    selected_filters[col] = vals
+
+    filter_key = hash_filters(selected_filters)
+    if selected_filters:
+        with st.spinner("Menerapkan filter secara bertahap…"):
+            summary = cached_summary(dataset_key, filter_key, data_file, selected_filters)
+    else:
+        summary = base_summary
+
+    num_cols = summary.numeric_columns()
+    cat_cols = summary.categorical_columns()
+    df_overview = summary.overview()
+
+    st.info(
+        "⚡ Mode streaming: statistik kuantil dan jumlah nilai unik adalah perkiraan. "
+        "File dibaca per chunk sehingga tabel penuh tidak dimuat ke memori; file unggahan "
+        "itu sendiri tetap disimpan utuh oleh server (dibatasi ukuran unggah maksimum)."
+    )
+
+    tab_labels = [
+        "📋 Overview",
+        "🔍 Missing Values",
+        "📈 Distribusi Numerik",
+        "📊 Distribusi Kategorikal",
+    ]
+    tab_widgets = {
+        tab_labels[2]: {"stream_dist_num": num_cols, "stream_dist_bins": None},
+        tab_labels[3]: {"stream_dist_cat": cat_cols, "stream_dist_topn": None},
+    }
+    active_tab = lazy_tabs(tab_labels, key="analysis_stream_tab", widgets=tab_widgets)
+
+    # -------------------- Tab 1: Overview --------------------
+    if active_tab == tab_labels[0]:
+        st.subheader("📋 Ringkasan Data")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Baris", summary.rows)
+        col2.metric("Total Kolom", len(summary.columns))
+        col3.metric("Kolom Numerik", len(num_cols))
+
+        col4, col5 = st.columns(2)
+        col4.metric("Kolom Kategorikal", len(cat_cols))
+        col5.metric("Kolom Hilang (>0%)", int((df_overview["Missing (%)"] > 0).sum()))
+
+        st.markdown("---")
+        st.subheader("🧾 Ringkasan per Kolom")
+        st.dataframe(df_overview, use_container_width=True)
+
+    # -------------------- Tab 2: Missing Values --------------------
+    elif active_tab == tab_labels[1]:
+        st.subheader("🚨 Analisis Nilai Hilang")
+        df_missing = df_overview[["Kolom", "Missing Count", "Missing (%)"]].sort_values(
+            by="Missing (%)", ascending=False
+        )
+        st.dataframe(df_missing, use_container_width=True)
+
+        mis_nonzero = df_missing[df_missing["Missing (%)"] > 0]
+        if not mis_nonzero.empty:
+            fig_mis = px.bar(
+                mis_nonzero,
+                x="Missing (%)",
+                y="Kolom",
+                orientation="h",
+                title="Persentase Nilai Hilang per Kolom",
+                text="Missing (%)",
+                color="Missing (%)",
+                color_continuous_scale="Reds",
+            )
+            fig_mis.update_layout(yaxis=dict(autorange="reversed"), height=400)
+            st.plotly_chart(fig_mis, use_container_width=True)
+        else:
+            st.info("Tidak ada nilai hilang pada data.")
+
+    # -------------------- Tab 3: Distribusi Numerik --------------------
+    elif active_tab == tab_labels[2]:
+        st.subheader("📈 Distribusi Kolom Numerik")
+        if num_cols:
+            col_num = st.selectbox("🏷️ Pilih Kolom Numerik", num_cols, key="stream_dist_num")
+            bins = st.slider("Jumlah Bin Histogram", min_value=5, max_value=100, value=30, key="stream_dist_bins")
+            state = summary.columns[col_num]
+
+            if state.count:
+                counts, edges = state.quantiles.histogram(bins)
+                df_hist = pd.DataFrame({
+                    col_num: (edges[:-1] + edges[1:]) / 2,
+                    "Perkiraan Jumlah": counts,
+                })
+                fig_hist = px.bar(df_hist, x=col_num, y="Perkiraan Jumlah", title=f"Histogram: {col_num}")
+                fig_hist.update_layout(bargap=0)
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+                Q1, median, Q3 = state.quantiles.quantile([0.25, 0.5, 0.75])
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                fig_box = go.Figure(go.Box(
+                    name=col_num,
+                    q1=[Q1],
+                    median=[median],
+                    q3=[Q3],
+                    lowerfence=[max(state.min, lower_bound)],
+                    upperfence=[min(state.max, upper_bound)],
+                ))
+                fig_box.update_layout(title=f"Boxplot: {col_num}")
+                st.plotly_chart(fig_box, use_container_width=True)
+
+                st.markdown(
+                    f"**Mean:** {state.mean:.4g} · **Std:** {np.sqrt(state.variance):.4g} · "
+                    f"**Min:** {state.min:.4g} · **Max:** {state.max:.4g}"
+                )
+                st.markdown(
+                    f"**Batas Outlier (perkiraan):** < {lower_bound:.2f} atau > {upper_bound:.2f}"
+                )
+            else:
+                st.info(f"Kolom {col_num} hanya berisi nilai kosong.")
+        else:
+            st.info("Tidak ada kolom numerik untuk distribusi.")
+
+    # -------------------- Tab 4: Distribusi Kategorikal --------------------
+    elif active_tab == tab_labels[3]:
+        st.subheader("📊 Distribusi Kolom Kategorikal")
+        if cat_cols:
+            col_cat = st.selectbox("🏷️ Pilih Kolom Kategorikal", cat_cols, key="stream_dist_cat")
+            top_n = st.slider(
+                "Tampilkan Top N Kategori Teratas", min_value=1, max_value=20, value=5, key="stream_dist_topn"
+            )
+            state = summary.columns[col_cat]
+            top_items = state.top.top(top_n)
+            df_cat = pd.DataFrame({
+                col_cat: [str(v) for v, _ in top_items],
+                "Count": [c for _, c in top_items],
+            })
+            st.dataframe(df_cat, use_container_width=True)
+            if state.top.error:
+                st.caption(f"Jumlah adalah batas bawah; selisih maksimum {state.top.error:,} per kategori.")
+
+            fig_cat = px.bar(
+                df_cat,
+                x="Count",
+                y=col_cat,
+                orientation="h",
+                title=f"Top {top_n} Kategori: {col_cat}",
+                labels={ "Count": "Jumlah", col_cat: col_cat },
+                color="Count",
+                color_continuous_scale="Viridis",
+            )
+            fig_cat.update_layout(yaxis=dict(autorange="reversed"), height=400)
+            st.plotly_chart(fig_cat, use_container_width=True)
+        else:
+            st.info("Tidak ada kolom kategorikal untuk dianalisa.")
+
+    st.markdown("---")
+    st.caption("✅ Analisa Data (Mode Streaming) Selesai.")
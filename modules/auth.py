@@ -19,6 +19,8 @@ def show_login():
 
 def show_logout():
     if st.sidebar.button(t("logout_button")):
+        from modules.session_resources import release_session
+        release_session()
         st.session_state.logout_message = True
         st.session_state.login_state = False
         st.session_state.username = ""
@@ -0,0 +1,151 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+
+# Di atas batas ini heatmap penuh terlalu berat untuk digambar,
+# sehingga yang ditampilkan adalah daftar pasangan terkuat (top-k).
+HEATMAP_MAX_COLS = 30
+BLOCK_SIZE = 64
+
+
+def _pairwise_block(xa, ma, xb, mb, min_periods):
+    # Semua besaran dihitung sebagai dot product matriks, sehingga pasangan
+    # dengan nilai hilang tetap memakai observasi yang lengkap (pairwise).
+    n = ma.T @ mb
+    sa = xa.T @ mb
+    sb = ma.T @ xb
+    saa = (xa * xa).T @ mb
+    sbb = ma.T @ (xb * xb)
+    sab = xa.T @ xb
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sab - sa * sb / n
+        var_a = saa - sa * sa / n
+        var_b = sbb - sb * sb / n
+        r = cov / np.sqrt(var_a * var_b)
+
+    r[n < max(min_periods, 2)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def block_corr(values: np.ndarray, block_size: int = BLOCK_SIZE, min_periods: int = 1) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    n_cols = values.shape[1]
+
+    mask = ~np.isnan(values)
+    # Centering per kolom lebih dulu agar dot product tidak kehilangan presisi
+    counts = mask.sum(axis=0)
+    means = np.nansum(values, axis=0) / np.maximum(counts, 1)
+    centered = np.where(mask, values - means, 0.0)
+    mask_f = mask.astype(np.float64)
+
+    out = np.empty((n_cols, n_cols), dtype=np.float64)
+    for i in range(0, n_cols, block_size):
+        xa, ma = centered[:, i:i + block_size], mask_f[:, i:i + block_size]
+        for j in range(i, n_cols, block_size):
+            xb, mb = centered[:, j:j + block_size], mask_f[:, j:j + block_size]
+            r = _pairwise_block(xa, ma, xb, mb, min_periods)
+            out[i:i + block_size, j:j + block_size] = r
+            out[j:j + block_size, i:i + block_size] = r.T
+
+    diag = np.diag_indices(n_cols)
+    # Kolom konstan/kosong tetap NaN seperti DataFrame.corr()
+    out[diag] = np.where(np.isnan(out[diag]), np.nan, 1.0)
+    return out
+
+
+def correlation_matrix(df: pd.DataFrame, method: str = "pearson", block_size: int = BLOCK_SIZE) -> pd.DataFrame:
+    data = df.astype(np.float64)
+    if method == "spearman":
+        # Spearman = Pearson atas ranking; ranking dihitung per kolom sekali atas semua
+        # nilai kolom itu. Jika ada nilai hilang, ini pendekatan: DataFrame.corr() me-ranking
+        # ulang per pasangan atas baris yang lengkap di kedua kolom (selisih kecil, ~1e-4
+        # pada 1% nilai hilang), yang terlalu mahal untuk matriks lebar.
+        data = data.rank(method="average")
+    elif method != "pearson":
+        raise ValueError(f"Metode korelasi tidak dikenal: {method}")
+    corr = block_corr(data.to_numpy(), block_size=block_size)
+    return pd.DataFrame(corr, index=df.columns, columns=df.columns)
+
+
+def top_pairs(corr: pd.DataFrame, k: int = 20) -> pd.DataFrame:
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices(values.shape[0], k=1)
+    r = values[rows, cols]
+    valid = ~np.isnan(r)
+    rows, cols, r = rows[valid], cols[valid], r[valid]
+    if r.size == 0:
+        return pd.DataFrame(columns=["Kolom A", "Kolom B", "Korelasi"])
+
+    k = min(k, r.size)
+    strongest = np.argpartition(-np.abs(r), k - 1)[:k]
+    strongest = strongest[np.argsort(-np.abs(r[strongest]))]
+    labels = corr.columns
+    return pd.DataFrame({
+        "Kolom A": labels[rows[strongest]],
+        "Kolom B": labels[cols[strongest]],
+        "Korelasi": r[strongest],
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_correlation(dataset_key: str, filter_key: str, cols: tuple, method: str, _df: pd.DataFrame) -> pd.DataFrame:
+    # _df tidak di-hash oleh Streamlit; identitas data ditentukan oleh
+    # dataset_key + filter_key + daftar kolom.
+    return correlation_matrix(_df[list(cols)], method=method)
+
+
+def correlation_widgets(key: str = "corr") -> dict:
+    # Key widget korelasi, untuk lazy_tabs(widgets=...)
+    return {f"{key}_method": None, f"{key}_topk": None}
+
+
+def render_correlation(df: pd.DataFrame, cols: list, dataset_key: str, filter_key: str, key: str = "corr"):
+    method_label = st.radio(
+        "Metode Korelasi", ["Pearson", "Spearman"], horizontal=True, key=f"{key}_method"
+    )
+    method = method_label.lower()
+
+    with st.spinner("Menghitung korelasi…"):
+        corr = cached_correlation(dataset_key, filter_key, tuple(cols), method, df)
+    if method == "spearman" and df[cols].isna().to_numpy().any():
+        st.caption(
+            "ℹ️ Data memiliki nilai hilang: ranking Spearman dihitung per kolom (bukan per pasangan), "
+            "sehingga hasil bisa sedikit berbeda dari perhitungan pairwise penuh."
+        )
+
+    if len(cols) <= HEATMAP_MAX_COLS:
+        st.dataframe(corr.round(2), use_container_width=True)
+
+        fig_corr = px.imshow(
+            corr,
+            text_auto=".2f",
+            aspect="auto",
+            color_continuous_scale="RdBu_r",
+            title=f"Heatmap Korelasi ({method_label})",
+        )
+        fig_corr.update_layout(height=500)
+        st.plotly_chart(fig_corr, use_container_width=True)
+    else:
+        st.info(
+            f"🔹 {len(cols)} kolom terlalu banyak untuk heatmap penuh; "
+            "ditampilkan pasangan dengan korelasi terkuat."
+        )
+        k = st.slider("Jumlah Pasangan Teratas", 5, 200, 25, key=f"{key}_topk")
+        df_pairs = top_pairs(corr, k=k)
+        st.dataframe(df_pairs.round({"Korelasi": 3}), use_container_width=True)
+
+        fig_pairs = px.bar(
+            df_pairs.assign(Pasangan=df_pairs["Kolom A"].astype(str) + " × " + df_pairs["Kolom B"].astype(str)),
+            x="Korelasi",
+            y="Pasangan",
+            orientation="h",
+            color="Korelasi",
+            color_continuous_scale="RdBu_r",
+            range_color=(-1, 1),
+            title=f"Top {len(df_pairs)} Pasangan Korelasi ({method_label})",
+        )
+        fig_pairs.update_layout(yaxis=dict(autorange="reversed"), height=max(400, 20 * len(df_pairs)))
+        st.plotly_chart(fig_pairs, use_container_width=True)
+    return corr
@@ -1,7 +1,34 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 from modules.config import t
+from modules.history import get_counters, recent_activity
+from modules.template_store import count_templates
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_status_charts(berhasil, gagal, lang):
+    # Grafik hanya dibangun ulang bila jumlah surat atau bahasa berubah
+    labels = [t("letters_success", lang), t("letters_failed", lang)]
+    colors = ["green", "red"]
+
+    fig_bar = go.Figure(go.Bar(x=labels, y=[berhasil, gagal], marker_color=colors))
+    fig_bar.update_layout(
+        title=t("letters_success_vs_failed", lang),
+        yaxis_title=t("total_letters", lang),
+        height=400,
+    )
+
+    fig_pie = go.Figure(go.Pie(
+        labels=labels,
+        values=[berhasil, gagal],
+        marker=dict(colors=colors, line=dict(color="black", width=1)),
+        textinfo="percent",
+        sort=False,
+        direction="clockwise",
+        rotation=90,
+    ))
+    fig_pie.update_layout(height=400)
+    return fig_bar, fig_pie
 
 def page_dashboard():
     st.title(t("dashboard_title", st.session_state.lang))
@@ -12,14 +39,15 @@ def page_dashboard():
 
     st.markdown("---")
 
-    generate_log = st.session_state.get("generate_log", [])
+    # Riwayat generate disimpan di SQLite dengan penghitung teragregasi per pengguna
+    counters = get_counters(st.session_state.username)
 
-    total_surat = len(generate_log)
-    berhasil = sum(1 for item in generate_log if item["Status"].startswith("✅"))
-    gagal = total_surat - berhasil
+    total_surat = counters["total"]
+    berhasil = counters["success"]
+    gagal = counters["failed"]
 
-    template_tersedia = st.session_state.get("template_count", 1)
-    data_peserta_terakhir = st.session_state.get("last_data_rows", 0)
+    template_tersedia = count_templates()
+    data_peserta_terakhir = counters["last_data_rows"]
 
     statistik_data = {
         "Statistik": [
@@ -42,28 +70,16 @@ def page_dashboard():
 
     st.markdown("---")
 
+    fig_bar, fig_pie = build_status_charts(berhasil, gagal, st.session_state.lang)
+
     st.markdown("### " + t("letters_success_vs_failed", st.session_state.lang))
-    fig, ax = plt.subplots()
-    ax.bar([t("letters_success", st.session_state.lang), t("letters_failed", st.session_state.lang)], [berhasil, gagal], color=["green", "red"])
-    ax.set_ylabel(t("total_letters", st.session_state.lang))
-    ax.set_title(t("letters_success_vs_failed", st.session_state.lang))
-    st.pyplot(fig)
+    st.plotly_chart(fig_bar, use_container_width=True)
 
     st.markdown("---")
 
     st.markdown("### " + t("percentage_letters", st.session_state.lang))
-    fig2, ax2 = plt.subplots()
     if total_surat > 0:
-        ax2.pie(
-            [berhasil, gagal],
-            labels=[t("letters_success", st.session_state.lang), t("letters_failed", st.session_state.lang)],
-            autopct="%1.1f%%",
-            colors=["green", "red"],
-            startangle=90,
-            wedgeprops={"edgecolor": "black"},
-        )
-        ax2.axis("equal")
-        st.pyplot(fig2)
+        st.plotly_chart(fig_pie, use_container_width=True)
     else:
         st.write(t("no_data", st.session_state.lang))
 
@@ -71,7 +87,7 @@ def page_dashboard():
 
     st.markdown("### " + t("last_activity", st.session_state.lang))
     aktivitas = []
-    for item in reversed(generate_log[-5:]):
+    for item in recent_activity(st.session_state.username, limit=5):
         aktivitas.append({"Aktivitas": f"{t('generate_title', st.session_state.lang)} untuk {item['Nama']}", "Status": item["Status"]})
     if aktivitas:
         df_aktivitas = pd.DataFrame(aktivitas)
@@ -5,19 +5,26 @@ import seaborn as sns
 import plotly.express as px
 from io import BytesIO
 
+from modules.correlation import correlation_widgets, render_correlation
+from modules.export import render_export
+from modules.filters import apply_filters
+from modules.grid import grid_widgets, render_grid
+from modules.hashing import hash_filters, upload_digest
+from modules.lazy import lazy_tabs, memoize
+from modules.session_resources import shared_object
+from modules.sampling import DEFAULT_SAMPLE_SIZE, MAX_STRATA, cached_sample, error_bounds, proportion_margin
+
 # Jika Anda ingin tetap pakai t(“…”), impor config:
 # from modules.config import t
 
 sns.set_style("whitegrid")
 
-@st.cache_data(show_spinner=False)
 def load_excel(file_bytes: bytes, sheet_name: str | None = None, nrows: int | None = None) -> pd.DataFrame:
     buf = BytesIO(file_bytes)
     if sheet_name:
         return pd.read_excel(buf, sheet_name=sheet_name, nrows=nrows)
     return pd.read_excel(buf, nrows=nrows)
 
-@st.cache_data(show_spinner=False)
 def load_csv(file_bytes: bytes, nrows: int | None = None) -> pd.DataFrame:
     buf = BytesIO(file_bytes)
     return pd.read_csv(buf, nrows=nrows)
@@ -33,7 +40,8 @@ def page_explorer():
     if data_source == "Contoh Seaborn":
         sample_name = st.sidebar.selectbox("Pilih contoh dataset Seaborn:", ("iris", "penguins", "titanic", "tips", "diamonds"))
         with st.spinner("Memuat dataset…"):
-            df = getattr(sns, sample_name).load_dataset(sample_name)
+            df = shared_object("explorer_df", f"seaborn:{sample_name}", lambda: sns.load_dataset(sample_name))
+        dataset_key = f"seaborn:{sample_name}"
     else:
         uploaded = st.sidebar.file_uploader("Unggah CSV atau Excel (xlsx)", type=["csv", "xlsx"])
         if uploaded:
@@ -50,11 +58,14 @@ def page_explorer():
                     help="Hanya memuat n baris pertama untuk pratinjau ringan."
                 )
 
+            file_bytes = uploaded.getvalue()
+            dataset_key = f"{upload_digest(uploaded)}:{selected_sheet}:{int(max_rows)}"
             try:
                 if uploaded.name.lower().endswith(".xlsx"):
-                    df = load_excel(uploaded.read(), sheet_name=selected_sheet, nrows=int(max_rows))
+                    loader = lambda: load_excel(file_bytes, sheet_name=selected_sheet, nrows=int(max_rows))
                 else:
-                    df = load_csv(uploaded.read(), nrows=int(max_rows))
+                    loader = lambda: load_csv(file_bytes, nrows=int(max_rows))
+                df = shared_object("explorer_df", dataset_key, loader)
             except Exception as e:
                 st.sidebar.error(f"Gagal memuat file: {e}")
                 return
@@ -67,7 +78,7 @@ def page_explorer():
 
     # 2. Preview Data
     st.subheader("1. Pratinjau Data")
-    st.dataframe(df.head(10), use_container_width=True)
+    render_grid(df, key="explorer_raw_grid", data_key=dataset_key)
 
     # 3. Filter Data
     st.sidebar.header("2. Filter Data")
@@ -85,13 +96,9 @@ def page_explorer():
                 r_min, r_max = st.slider(f"{col}", mi, ma, (mi, ma))
                 filter_values[col] = (r_min, r_max)
 
-    df_filtered = df.copy()
-    for col, cond in filter_values.items():
-        if isinstance(cond, list):
-            df_filtered = df_filtered[df_filtered[col].isin(cond)]
-        else:
-            lo, hi = cond
-            df_filtered = df_filtered[df_filtered[col].between(lo, hi)]
+    # df dipakai bersama antar sesi; filter selalu menghasilkan frame baru
+    df_filtered = apply_filters(df, filter_values)
+    filter_key = hash_filters(filter_values)
 
     st.info(f"Data setelah filter: {df_filtered.shape[0]} baris × {df_filtered.shape[1]} kolom.")
 
@@ -103,33 +110,48 @@ def page_explorer():
     sel_num_cols = st.sidebar.multiselect("Kolom Numerik", options=numeric_cols, default=numeric_cols[:3])
     sel_cat_cols = st.sidebar.multiselect("Kolom Kategorikal", options=categorical_cols, default=categorical_cols[:3])
 
-    # 5. Sampling (jika >5000 baris)
-    if df_filtered.shape[0] > 5000:
-        df_sample = df_filtered.sample(5000, random_state=42)
-        st.info("🔹 Tampilan diambil dari sampel 5.000 baris.")
-    else:
-        df_sample = df_filtered
-
-    # 6. Hitung Missing Values
-    missing_count = df_sample.isnull().sum()
-    missing_pct = (missing_count / df_sample.shape[0] * 100).round(2)
-    df_missing = pd.DataFrame({
-        "Kolom": df_sample.columns,
-        "Missing Count": missing_count.values,
-        "Missing (%)": missing_pct.values
-    }).sort_values(by="Missing (%)", ascending=False)
-
-    # 7. Tab Layout
-    tabs = st.tabs([
+    data_key = (dataset_key, filter_key)
+
+    # 5. Sampling: satu sampel per (dataset, filter) dipakai ulang di semua tab
+    with st.sidebar.expander("🎯 Opsi Sampling", expanded=False):
+        sample_size = int(st.number_input(
+            "Ukuran sampel", 500, 100_000, DEFAULT_SAMPLE_SIZE, step=500, key="sample_size"
+        ))
+        # Hanya kolom berkardinalitas rendah yang masuk akal sebagai strata
+        strata_options = memoize("explorer_strata_cols", data_key, lambda: [
+            c for c in categorical_cols if df_filtered[c].nunique(dropna=False) <= MAX_STRATA
+        ])
+        strata_col = st.selectbox(
+            "Stratifikasi berdasarkan", [None] + strata_options,
+            format_func=lambda c: "— Tanpa stratifikasi —" if c is None else c,
+            key="sample_strata",
+        )
+    sample = cached_sample(dataset_key, filter_key, sample_size, strata_col, df_filtered)
+    df_sample = sample.df
+    if sample.is_sampled:
+        kind = f"sampel berstrata ({strata_col})" if strata_col else "sampel acak"
+        st.info(f"🔹 Tampilan diambil dari {kind} {len(df_sample):,} baris.")
+
+    # 6. Tab Layout (hanya tab aktif yang dihitung)
+    tab_labels = [
         "📋 Ringkasan",
         "📊 Statistik",
         "📈 Visualisasi",
         "🔗 Korelasi",
         "🧮 Pivot"
-    ])
+    ]
+    all_cols = df_filtered.columns.tolist()
+    # Widget di tiap tab (pilihan sah atau None) agar pengaturannya tetap ada saat tab berganti
+    tab_widgets = {
+        tab_labels[0]: grid_widgets("explorer_grid", all_cols),
+        tab_labels[2]: {"hist_col": sel_num_cols, "hist_bins": None, "bar_col": sel_cat_cols, "bar_top": None},
+        tab_labels[3]: {"corr_cols": numeric_cols, **correlation_widgets("explorer_corr")},
+        tab_labels[4]: {"pivot_idx": all_cols, "pivot_cols": all_cols, "pivot_vals": numeric_cols, "pivot_agg": None},
+    }
+    active_tab = lazy_tabs(tab_labels, key="explorer_tab", widgets=tab_widgets)
 
     # Tab Ringkasan
-    with tabs[0]:
+    if active_tab == tab_labels[0]:
         st.subheader("📋 Ringkasan Data")
         c1, c2, c3 = st.columns(3)
         c1.metric("Total Baris", f"{df_filtered.shape[0]:,}")
@@ -138,41 +160,52 @@ def page_explorer():
 
         c4, c5 = st.columns(2)
         c4.metric("Kolom Kategorikal", len(categorical_cols))
-        total_missing = df_filtered.isnull().sum().sum()
+        total_missing = memoize("explorer_missing", data_key, lambda: df_filtered.isnull().sum().sum())
         c5.metric("Total Nilai Hilang", f"{total_missing:,}")
 
         st.markdown("---")
-        st.subheader("🔍 10 Baris Pertama")
-        st.dataframe(df_filtered.head(10), use_container_width=True)
+        st.subheader("🔍 Data Terfilter")
+        render_grid(df_filtered, key="explorer_grid", data_key=data_key)
         csv_head = df_filtered.head(10).to_csv(index=False).encode("utf-8")
         st.download_button("⬇️ Unduh 10 Baris (CSV)", data=csv_head, file_name="head10.csv", mime="text/csv")
 
     # Tab Statistik
-    with tabs[1]:
+    elif active_tab == tab_labels[1]:
         st.subheader("📊 Statistik Deskriptif")
         if sel_num_cols:
             st.markdown("**Numerik**")
-            st.dataframe(df_sample[sel_num_cols].describe().T, use_container_width=True)
+            sample_key = data_key + (sample_size, strata_col, tuple(sel_num_cols))
+            desc_num = memoize("explorer_desc", sample_key, lambda: df_sample[sel_num_cols].describe().T)
+            st.dataframe(desc_num, use_container_width=True)
+            if sample.is_sampled:
+                st.markdown("**Perkiraan Mean (selang kepercayaan 95%)**")
+                bounds = memoize("explorer_bounds", sample_key, lambda: error_bounds(sample, sel_num_cols))
+                st.dataframe(bounds, use_container_width=True)
+                if strata_col:
+                    st.caption("Statistik deskriptif di atas belum dibobot; gunakan perkiraan mean terbobot ini.")
         else:
             st.info("Pilih kolom numerik di sidebar.")
 
         if sel_cat_cols:
             st.markdown("**Kategorikal**")
-            st.dataframe(df_sample[sel_cat_cols].describe().T, use_container_width=True)
+            desc_cat = memoize(
+                "explorer_desc", data_key + (sample_size, strata_col, tuple(sel_cat_cols)),
+                lambda: df_sample[sel_cat_cols].describe().T,
+            )
+            st.dataframe(desc_cat, use_container_width=True)
+            if sample.is_sampled and not strata_col:
+                st.caption(f"Proporsi kategori dari sampel: margin error maksimum ±{proportion_margin(sample):.1%} (95%).")
         else:
             st.info("Pilih kolom kategorikal di sidebar.")
 
     # Tab Visualisasi
-    with tabs[2]:
+    elif active_tab == tab_labels[2]:
         st.subheader("📈 Visualisasi Interaktif")
         if sel_num_cols:
             st.markdown("### Histogram & Boxplot (Numerik)")
             col_hist = st.selectbox("Pilih Kolom Numerik", sel_num_cols, key="hist_col")
             bins = st.slider("Jumlah Bin", 5, 100, 30, key="hist_bins")
             data_hist = df_sample[col_hist].dropna()
-            if data_hist.shape[0] > 5000:
-                data_hist = data_hist.sample(5000, random_state=42)
-                st.info("🔹 Sampel 5.000 baris untuk histogram.")
 
             fig_hist = px.histogram(data_hist, nbins=bins, title=f"Histogram {col_hist}", labels={col_hist: col_hist})
             st.plotly_chart(fig_hist, use_container_width=True)
@@ -187,7 +220,9 @@ def page_explorer():
             st.markdown("### Bar Chart (Kategorikal)")
             col_bar = st.selectbox("Pilih Kolom Kategorikal", sel_cat_cols, key="bar_col")
             top_n = st.slider("Top N Kategori", 1, 20, 5, key="bar_top")
-            vc = df_filtered[col_bar].value_counts(dropna=False).head(top_n)
+            vc = memoize(
+                "explorer_vc", data_key + (col_bar,), lambda: df_filtered[col_bar].value_counts(dropna=False)
+            ).head(top_n)
             df_vc = pd.DataFrame({col_bar: vc.index.astype(str), "Count": vc.values})
 
             fig_bar = px.bar(df_vc, x="Count", y=col_bar, orientation="h",
@@ -199,36 +234,25 @@ def page_explorer():
             st.info("Pilih kolom kategorikal di sidebar.")
 
     # Tab Korelasi
-    with tabs[3]:
+    elif active_tab == tab_labels[3]:
         st.subheader("🔗 Korelasi & Heatmap")
         if len(numeric_cols) >= 2:
-            if len(numeric_cols) > 20:
-                top20 = df_filtered[numeric_cols].var().sort_values(ascending=False).index.tolist()[:20]
-                corr_cols = st.multiselect("Pilih hingga 20 kolom", options=top20, default=top20[:5], key="corr_cols")
-            else:
-                corr_cols = numeric_cols
+            # Urutkan berdasarkan varians agar kolom paling informatif muncul lebih dulu
+            by_var = memoize(
+                "explorer_var", data_key, lambda: df_filtered[numeric_cols].var().sort_values(ascending=False).index.tolist()
+            )
+            corr_cols = st.multiselect("Pilih kolom", options=by_var, default=by_var, key="corr_cols")
 
             if corr_cols:
-                df_corr = df_filtered[corr_cols]
-                if df_corr.shape[0] > 5000:
-                    df_corr = df_corr.sample(5000, random_state=42)
-                    st.info("🔹 Sampel 5.000 baris untuk korelasi.")
-                corr_m = df_corr.corr()
-                st.dataframe(corr_m.round(2), use_container_width=True)
-
-                fig_corr = px.imshow(corr_m, text_auto=".2f", aspect="auto",
-                                     color_continuous_scale="RdBu_r", title="Heatmap Korelasi")
-                fig_corr.update_layout(height=500)
-                st.plotly_chart(fig_corr, use_container_width=True)
+                render_correlation(df_filtered, corr_cols, dataset_key, filter_key, key="explorer_corr")
             else:
                 st.info("Pilih setidaknya satu kolom untuk korelasi.")
         else:
             st.info("Perlu setidaknya 2 kolom numerik.")
 
     # Tab Pivot
-    with tabs[4]:
+    elif active_tab == tab_labels[4]:
         st.subheader("🧮 Pivot Table")
-        all_cols = df_filtered.columns.tolist()
 
         idx_cols = st.multiselect("Index (Baris)", all_cols, default=all_cols[:1], key="pivot_idx")
         col_piv = st.multiselect("Columns", all_cols, default=all_cols[1:2], key="pivot_cols")
@@ -241,13 +265,17 @@ def page_explorer():
         if idx_cols and col_piv and val_cols:
             with st.spinner("Menghitung Pivot…"):
                 try:
-                    pivot_df = pd.pivot_table(
-                        df_filtered,
-                        index=idx_cols,
-                        columns=col_piv,
-                        values=val_cols,
-                        aggfunc=aggfunc,
-                        fill_value=0
+                    pivot_df = memoize(
+                        "explorer_pivot",
+                        data_key + (tuple(idx_cols), tuple(col_piv), tuple(val_cols), aggfunc),
+                        lambda: pd.pivot_table(
+                            df_filtered,
+                            index=idx_cols,
+                            columns=col_piv,
+                            values=val_cols,
+                            aggfunc=aggfunc,
+                            fill_value=0
+                        ),
                     )
                 except Exception as e:
                     st.error(f"Gagal membuat pivot: {e}")
@@ -273,8 +301,7 @@ def page_explorer():
 
     # Sidebar: Unduh semua data hasil filter
     st.sidebar.header("4. Unduh Hasil Filter")
-    csv_all = df_filtered.to_csv(index=False).encode("utf-8")
-    st.sidebar.download_button("⬇️ Unduh CSV Terfilter", data=csv_all, file_name="data_filtered.csv", mime="text/csv")
+    render_export(df_filtered, dataset_key, filter_key, key="explorer_export", container=st.sidebar)
 
 
 if __name__ == "__main__":
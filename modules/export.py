@@ -0,0 +1,165 @@
+import streamlit as st
+import pandas as pd
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet opsional, hanya tersedia jika pyarrow terpasang
+    pa = None
+    pq = None
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "aduanpmt_exports")
+EXPORT_MAX_FILES = 50
+# Ekspor berisi data unggahan pengguna; file yang lama tidak dipakai dihapus
+EXPORT_MAX_AGE_S = int(os.environ.get("ADUANPMT_EXPORT_MAX_AGE_S", "3600"))
+CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_575
+
+EXPORT_FORMATS = {
+    "CSV": {"ext": "csv", "mime": "text/csv"},
+    "CSV (gzip)": {"ext": "csv.gz", "mime": "application/gzip"},
+    "Excel (xlsx)": {"ext": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+if pq is not None:
+    EXPORT_FORMATS["Parquet"] = {"ext": "parquet", "mime": "application/vnd.apache.parquet"}
+
+
+def _write_csv(df: pd.DataFrame, fh, chunk_rows: int):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(fh, index=False, header=start == 0)
+
+
+def _write_parquet(df: pd.DataFrame, path: str, chunk_rows: int):
+    writer = None
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            table = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(df: pd.DataFrame, fmt: str, path: str, chunk_rows: int = CHUNK_ROWS):
+    if fmt == "CSV":
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            _write_csv(df, fh, chunk_rows)
+    elif fmt == "CSV (gzip)":
+        with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6) as fh:
+            _write_csv(df, fh, chunk_rows)
+    elif fmt == "Excel (xlsx)":
+        if len(df) > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel hanya mendukung {EXCEL_MAX_ROWS:,} baris; gunakan CSV atau Parquet.")
+        df.to_excel(path, index=False, engine="openpyxl")
+    elif fmt == "Parquet" and pq is not None:
+        _write_parquet(df, path, chunk_rows)
+    else:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+
+
+def _prune_exports():
+    # Sesi lain bisa menghapus file di antara listdir dan stat, jadi file yang hilang dilewati
+    now = time.time()
+    entries = []
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            continue
+        if name.endswith(".tmp"):
+            # File sementara yang masih ditulis sesi lain tidak dihitung; sisa yang lama dihapus
+            if now - mtime > EXPORT_MAX_AGE_S:
+                _remove_quietly(path)
+            continue
+        entries.append((mtime, path))
+    entries.sort(reverse=True)
+    for i, (mtime, path) in enumerate(entries):
+        if i >= EXPORT_MAX_FILES or now - mtime > EXPORT_MAX_AGE_S:
+            _remove_quietly(path)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def export_path(dataset_key: str, filter_key: str, fmt: str) -> str:
+    digest = hashlib.sha1(f"{dataset_key}|{filter_key}|{fmt}".encode("utf-8")).hexdigest()
+    return os.path.join(EXPORT_DIR, f"{digest}.{EXPORT_FORMATS[fmt]['ext']}")
+
+
+def build_export(df: pd.DataFrame, dataset_key: str, filter_key: str, fmt: str) -> str:
+    # File hasil ekspor disimpan di disk per kombinasi data + filter + format,
+    # sehingga rerun berikutnya cukup membuka file yang sudah ada.
+    path = export_path(dataset_key, filter_key, fmt)
+    try:
+        # Dipakai ulang: mtime diperbarui agar tidak ikut dibersihkan karena umur
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    # Hanya proses aplikasi yang boleh membaca ekspor di direktori temp bersama
+    os.makedirs(EXPORT_DIR, mode=0o700, exist_ok=True)
+    # Semua sesi adalah thread dalam satu proses, jadi nama file sementara harus unik per penulis
+    fd, tmp_path = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_export(df, fmt, tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Sesi lain menulis file yang sama lebih dulu; isinya identik
+            if not os.path.exists(path):
+                raise
+    finally:
+        _remove_quietly(tmp_path)
+    _prune_exports()
+    return path
+
+
+def export_widgets(key: str) -> dict:
+    # Key widget ekspor untuk lazy_tabs(widgets=...); tombol tidak ikut karena nilainya tidak disimpan
+    return {f"{key}_fmt": list(EXPORT_FORMATS.keys())}
+
+
+def render_export(df: pd.DataFrame, dataset_key: str, filter_key: str, key: str,
+                  container=st, file_stem: str = "data_filtered"):
+    fmt = container.selectbox("Format Unduhan", list(EXPORT_FORMATS.keys()), key=f"{key}_fmt")
+
+    # download_button membaca seluruh file ke memori dan menyalinnya ke media store di setiap
+    # run tempat ia tampil. Karena itu file hanya dilampirkan pada run setelah "Siapkan" ditekan;
+    # rerun berikutnya kembali menampilkan tombol "Siapkan" (yang memakai cache disk bila ada).
+    if not container.button("📦 Siapkan Unduhan", key=f"{key}_prepare"):
+        return
+    try:
+        with st.spinner("Menyiapkan file unduhan…"):
+            path = build_export(df, dataset_key, filter_key, fmt)
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        # Dibersihkan sesi lain (umur/jumlah file) tepat setelah disiapkan
+        container.warning("File unduhan sudah kedaluwarsa; silakan siapkan ulang.")
+        return
+    except Exception as e:
+        container.error(f"Gagal menyiapkan unduhan: {e}")
+        return
+    with fh:
+        size_mb = os.fstat(fh.fileno()).st_size / (1024 * 1024)
+        container.download_button(
+            f"⬇️ Unduh {fmt} ({size_mb:.1f} MB)",
+            data=fh,
+            file_name=f"{file_stem}.{EXPORT_FORMATS[fmt]['ext']}",
+            mime=EXPORT_FORMATS[fmt]["mime"],
+            key=f"{key}_download",
+        )
+    container.caption("Tombol unduh hanya tersedia sampai ada interaksi berikutnya; siapkan ulang bila perlu.")
@@ -0,0 +1,17 @@
+import pandas as pd
+import numpy as np
+
+
+def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    # Semua kondisi digabung ke satu mask, sehingga data hanya disalin sekali
+    # (bukan satu salinan per kolom filter). List -> isin, tuple (lo, hi) -> between.
+    mask = np.ones(len(df), dtype=bool)
+    for col, cond in filters.items():
+        if isinstance(cond, list):
+            mask &= df[col].isin(cond).to_numpy()
+        else:
+            lo, hi = cond
+            mask &= df[col].between(lo, hi).to_numpy()
+    if mask.all():
+        return df
+    return df[mask]
@@ -1,70 +1,183 @@
 import streamlit as st
 import pandas as pd
-from docxtpl import DocxTemplate
-from docx import Document
 from io import BytesIO
+import os
 import zipfile
-from modules.utils import add_hyperlink, set_paragraph_style
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from modules.utils import add_hyperlink
 from modules.config import t
+from modules.history import record_batch
+from modules.templates import get_registry
+from modules.hashing import upload_digest
+from modules.session_resources import shared_object
+from modules.grid import render_grid
+from modules.zip_writer import PrecompressedZipWriter, deflate
 from docx.shared import Pt
 
-def generate_letters_with_progress(template_file, df, col_name, col_link):
+def insert_short_link(doc, url):
+    for p in doc.paragraphs:
+        if "[short_link]" in p.text:
+            parts = p.text.split("[short_link]")
+            p.clear()
+            if parts[0]:
+                run_before = p.add_run(parts[0])
+                run_before.font.name = "Arial"
+                run_before.font.size = Pt(12)
+            add_hyperlink(p, url, url)
+            if len(parts) > 1 and parts[1]:
+                run_after = p.add_run(parts[1])
+                run_after.font.name = "Arial"
+                run_after.font.size = Pt(12)
+
+# File .docx sudah berupa arsip zip, sehingga kompresi ulang hanya sedikit
+# memperkecil ukuran; "store" adalah pilihan tercepat.
+ARCHIVE_STRATEGIES = {
+    "store": "Tanpa kompresi (tercepat)",
+    "deflate": "Deflate",
+    "parallel": "Deflate paralel (thread)",
+}
+
+# Batas jumlah grup yang bisa dipetakan ke template lewat UI
+MAX_ROUTE_GROUPS = 50
+
+def group_label(value):
+    return "(kosong)" if pd.isna(value) else str(value)
+
+def group_folder(label):
+    # Label grup menjadi nama folder di ZIP: pemisah path diganti, lalu nama kosong,
+    # "." dan ".." dipetakan ke placeholder agar tidak keluar dari folder ekstraksi
+    folder = label.replace("/", "-").replace("\\", "-").strip().strip(".").strip()
+    return folder or "(kosong)"
+
+def _finish_pending(zf, item, log):
+    # Status baris baru ditentukan setelah entrinya benar-benar tertulis ke ZIP
+    log_idx, name, future = item
+    try:
+        zf.write_deflated(name, *future.result())
+        log[log_idx]["Status"] = "✅ Berhasil"
+    except Exception as e:
+        log[log_idx]["Status"] = f"❌ Gagal: {str(e)}"
+
+def build_letters_archive(template, df, col_name, col_link, strategy="store", level=6, workers=None, on_progress=None,
+                          route_col=None, routes=None):
+    # Jika route_col diisi, template tiap baris dipilih dari routes (label grup -> template
+    # terkompilasi; grup tanpa pemetaan memakai template utama) dan surat dikelompokkan
+    # per folder grup di dalam ZIP. Semua varian dirender dalam satu lintasan data.
+    routes = routes or {}
     output_zip = BytesIO()
     log = []
-    with zipfile.ZipFile(output_zip, "w") as zf:
+    compression = zipfile.ZIP_STORED if strategy == "store" else zipfile.ZIP_DEFLATED
+    workers = workers or min(4, os.cpu_count() or 1)
+    executor = ThreadPoolExecutor(max_workers=workers) if strategy == "parallel" else None
+    pending = deque()
+
+    # Strategi paralel menulis entri yang sudah dikompresi lewat penulis ZIP sendiri
+    if executor is None:
+        archive = zipfile.ZipFile(output_zip, "w", compression=compression, compresslevel=level)
+    else:
+        archive = PrecompressedZipWriter(output_zip)
+    with archive as zf:
         total = len(df)
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        for idx, row in df.iterrows():
-            try:
-                tpl = DocxTemplate(template_file)
-                tpl.render({"nama_penyelenggara": row[col_name], "short_link": "[short_link]"})
-                temp_buf = BytesIO()
-                tpl.save(temp_buf)
-                temp_buf.seek(0)
-
-                doc = Document(temp_buf)
-                for p in doc.paragraphs:
-                    if "[short_link]" in p.text:
-                        parts = p.text.split("[short_link]")
-                        p.clear()
-                        if parts[0]:
-                            run_before = p.add_run(parts[0])
-                            run_before.font.name = "Arial"
-                            run_before.font.size = Pt(12)
-                        add_hyperlink(p, str(row[col_link]), str(row[col_link]))
-                        if len(parts) > 1 and parts[1]:
-                            run_after = p.add_run(parts[1])
-                            run_after.font.name = "Arial"
-                            run_after.font.size = Pt(12)
-                    p.alignment = 1  # WD_ALIGN_PARAGRAPH.JUSTIFY
-
-                set_paragraph_style(doc)
-
-                final_buf = BytesIO()
-                doc.save(final_buf)
-                zf.writestr(f"{row[col_name]}.docx", final_buf.getvalue())
-                log.append({"Nama": row[col_name], "Status": "✅ Berhasil"})
-            except Exception as e:
-                log.append({"Nama": row[col_name], "Status": f"❌ Gagal: {str(e)}"})
+        groups = df[route_col].map(group_label).tolist() if route_col else [None] * total
+        try:
+            # Hanya kolom yang dipakai yang dibaca (lebih ringan daripada iterrows)
+            for idx, (nama, link, group) in enumerate(zip(df[col_name].tolist(), df[col_link].tolist(), groups)):
+                row_template = routes.get(group, template)
+                entry = {"Nama": nama}
+                if route_col:
+                    entry.update({"Grup": group, "Template": row_template.name})
+                try:
+                    # Template sudah dikompilasi (XML + Jinja + gaya) di registry bersama
+                    doc = row_template.render({"nama_penyelenggara": nama, "short_link": "[short_link]"})
+                    insert_short_link(doc, str(link))
+
+                    final_buf = BytesIO()
+                    doc.save(final_buf)
+                    name = f"{nama}.docx" if group is None else f"{group_folder(group)}/{nama}.docx"
+                    if executor is None:
+                        zf.writestr(name, final_buf.getvalue())
+                        log.append({**entry, "Status": "✅ Berhasil"})
+                    else:
+                        # Kompresi berjalan di thread lain (zlib melepas GIL) selagi surat berikutnya dirender;
+                        # indeks log ikut disimpan agar status dicatat setelah entri ditulis
+                        log.append({**entry, "Status": "⏳ Diproses"})
+                        future = executor.submit(deflate, final_buf.getvalue(), level)
+                        pending.append((len(log) - 1, name, future))
+                except Exception as e:
+                    log.append({**entry, "Status": f"❌ Gagal: {str(e)}"})
 
-            progress = int((idx + 1) / total * 100)
-            progress_bar.progress(progress)
-            status_text.text(f"{t('processing_letters', st.session_state.lang)} {idx + 1} / {total}")
+                while pending and (len(pending) > workers * 2 or pending[0][2].done()):
+                    _finish_pending(zf, pending.popleft(), log)
+
+                if on_progress:
+                    on_progress(idx + 1, total)
+
+            while pending:
+                _finish_pending(zf, pending.popleft(), log)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
 
     output_zip.seek(0)
     return output_zip, log
 
+def generate_letters_with_progress(template, df, col_name, col_link, strategy="store", level=6,
+                                   route_col=None, routes=None):
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    def on_progress(done, total):
+        progress_bar.progress(int(done / total * 100))
+        status_text.text(f"{t('processing_letters', st.session_state.lang)} {done} / {total}")
+
+    return build_letters_archive(
+        template, df, col_name, col_link, strategy, level,
+        on_progress=on_progress, route_col=route_col, routes=routes,
+    )
+
 def page_generate():
     st.title(t("generate_title", st.session_state.lang))
 
-    template_file = st.file_uploader(t("upload_template", st.session_state.lang), type="docx")
+    registry = get_registry()
+    library = registry.list()
+
+    # Template diunggah sekali ke pustaka bersama, lalu cukup dipilih
+    if "template_source" not in st.session_state:
+        st.session_state.template_source = "Pustaka Template" if library else "Unggah Template Baru"
+    template_source = st.radio(
+        "Sumber Template",
+        ["Pustaka Template", "Unggah Template Baru"],
+        horizontal=True,
+        key="template_source",
+    )
+    template = None
+    if template_source == "Pustaka Template" and not library:
+        st.info("Pustaka template masih kosong; unggah template baru terlebih dahulu.")
+    elif template_source == "Pustaka Template":
+        digest = st.selectbox(
+            "Pilih Template",
+            [m["digest"] for m in library],
+            format_func=lambda d: next(m["name"] for m in library if m["digest"] == d),
+            key="template_pick",
+        )
+        template = registry.get(digest)
+    else:
+        template_file = st.file_uploader(t("upload_template", st.session_state.lang), type="docx")
+        if template_file:
+            try:
+                template = registry.get(registry.add(template_file.getvalue(), template_file.name))
+            except Exception as e:
+                st.error(f"Template tidak valid: {e}")
+
     data_file = st.file_uploader(t("upload_data", st.session_state.lang), type="xlsx")
 
-    if template_file and data_file:
-        df = pd.read_excel(data_file)
+    if template and data_file:
+        # Unggahan yang identik hanya disimpan sekali di memori server
+        data_key = f"excel:{upload_digest(data_file)}"
+        df = shared_object("generate_df", data_key, lambda: pd.read_excel(data_file))
         st.success(f"{len(df)} rows loaded successfully")
-        st.dataframe(df)
+        render_grid(df, key="generate_grid", data_key=data_key)
 
         col_name = st.selectbox(t("select_name_col", st.session_state.lang), df.columns)
         col_link = st.selectbox(t("select_link_col", st.session_state.lang), df.columns)
@@ -73,21 +186,43 @@ def page_generate():
         filtered_names = df[df[col_name].astype(str).str.contains(search_name, case=False, na=False)][col_name].unique()
         selected_name = st.selectbox(t("select_name_preview", st.session_state.lang), filtered_names)
 
-        st.session_state.df = df
         st.session_state.col_name = col_name
         st.session_state.col_link = col_link
         st.session_state.selected_name = selected_name
-        st.session_state.template_file = template_file
+        st.session_state.template_digest = template.digest
+
+        # Varian surat per grup (mis. per wilayah/status): satu kolom menentukan template tiap baris
+        route_col = None
+        routes = {}
+        with st.expander("🔀 Template per Grup (opsional)"):
+            route_choice = st.selectbox(
+                "Kolom Penentu Template", ["(tidak dipakai)"] + list(df.columns), key="route_col"
+            )
+            if route_choice != "(tidak dipakai)":
+                group_values = sorted(set(df[route_choice].map(group_label)))
+                library = registry.list()
+                template_names = {m["digest"]: m["name"] for m in library}
+                if len(group_values) > MAX_ROUTE_GROUPS:
+                    st.warning(f"Kolom ini memiliki {len(group_values)} nilai unik (maks. {MAX_ROUTE_GROUPS}).")
+                elif not library:
+                    st.info("Pustaka template masih kosong; unggah varian template terlebih dahulu.")
+                else:
+                    route_col = route_choice
+                    st.caption("Grup tanpa pilihan memakai template utama. Varian diunggah lewat 'Unggah Template Baru'.")
+                    for value in group_values:
+                        digest = st.selectbox(
+                            f"Template untuk '{value}'",
+                            [""] + list(template_names),
+                            format_func=lambda d: template_names.get(d, "(template utama)"),
+                            key=f"route_{route_choice}_{value}",
+                        )
+                        if digest:
+                            routes[value] = registry.get(digest)
 
         if st.session_state.get("show_preview", True) and selected_name:
             row = df[df[col_name] == selected_name].iloc[0]
-            tpl = DocxTemplate(template_file)
-            tpl.render({"nama_penyelenggara": row[col_name], "short_link": "[short_link]"})
-            temp_buf = BytesIO()
-            tpl.save(temp_buf)
-            temp_buf.seek(0)
-
-            doc = Document(temp_buf)
+            row_template = routes.get(group_label(row[route_col]), template) if route_col else template
+            doc = row_template.render({"nama_penyelenggara": row[col_name], "short_link": "[short_link]"})
             preview_text = "\n\n".join([p.text for p in doc.paragraphs if p.text.strip()])
             st.text_area(t("preview_letter", st.session_state.lang), preview_text, height=300)
 
@@ -101,12 +236,30 @@ def page_generate():
                 file_name=f"preview_{row[col_name]}.docx",
             )
 
+        with st.expander("🗜️ Opsi Arsip ZIP"):
+            strategy = st.selectbox(
+                "Strategi Kompresi",
+                list(ARCHIVE_STRATEGIES),
+                format_func=ARCHIVE_STRATEGIES.get,
+                key="archive_strategy",
+            )
+            level = st.slider(
+                "Level Kompresi", 1, 9, 6, key="archive_level", disabled=strategy == "store"
+            )
+
         if st.button(t("generate_all", st.session_state.lang)):
             with st.spinner(t("processing_letters", st.session_state.lang)):
-                zip_file, log = generate_letters_with_progress(template_file, df, col_name, col_link)
+                zip_file, log = generate_letters_with_progress(
+                    template, df, col_name, col_link, strategy, level, route_col=route_col, routes=routes
+                )
+            template_name = ", ".join(sorted({template.name} | {tpl.name for tpl in routes.values()}))
+            record_batch(st.session_state.username, log, template_name, len(df))
             st.success(t("generate_done", st.session_state.lang))
             st.download_button(t("download_all_zip", st.session_state.lang), zip_file.getvalue(), file_name="surat_massal.zip")
             with st.expander(t("view_log", st.session_state.lang)):
-                st.dataframe(pd.DataFrame(log))
+                log_df = pd.DataFrame(log)
+                if route_col:
+                    st.dataframe(log_df.groupby(["Grup", "Template"]).size().reset_index(name="Jumlah Surat"))
+                st.dataframe(log_df)
     else:
         st.info(t("upload_first", st.session_state.lang))
\ No newline at end of file
@@ -0,0 +1,90 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from modules.lazy import memoize
+
+PAGE_SIZES = [25, 50, 100, 250]
+NO_SORT = "(urutan asli)"
+ALL_COLUMNS = "(semua kolom)"
+
+
+def _sort_order(series: pd.Series, ascending: bool) -> np.ndarray:
+    # Posisi baris terurut (stabil, nilai kosong di akhir)
+    series = series.reset_index(drop=True)
+    try:
+        ordered = series.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # Kolom object dengan tipe campuran: urutkan sebagai teks
+        ordered = series.astype(str).where(series.notna()).sort_values(
+            ascending=ascending, kind="stable", na_position="last"
+        )
+    return ordered.index.to_numpy()
+
+
+def _match_mask(df: pd.DataFrame, col, query: str) -> np.ndarray:
+    # Mask baris yang memuat kata kunci; dicari per kolom lalu digabung dengan OR,
+    # sehingga tidak ada salinan teks seukuran seluruh tabel yang disimpan
+    columns = df.columns if col == ALL_COLUMNS else [col]
+    mask = np.zeros(len(df), dtype=bool)
+    for c in columns:
+        mask |= df[c].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    return mask
+
+
+def grid_widgets(key: str, columns: list) -> dict:
+    # Key widget tabel beserta pilihan yang sah, untuk lazy_tabs(widgets=...)
+    return {
+        f"{key}_search_col": [ALL_COLUMNS] + columns,
+        f"{key}_query": None,
+        f"{key}_sort_col": [NO_SORT] + columns,
+        f"{key}_sort_dir": None,
+        f"{key}_page_size": None,
+        f"{key}_page": None,
+    }
+
+
+def render_grid(df: pd.DataFrame, key: str, data_key, page_size: int = PAGE_SIZES[0]) -> pd.DataFrame:
+    # Tabel berhalaman di sisi server: hanya baris di halaman aktif yang dikirim ke browser,
+    # sehingga ukuran payload tidak bergantung pada jumlah baris. Indeks urutan disimpan di
+    # memo sesi per (data_key, kolom); mask pencarian hanya disimpan untuk kata kunci terakhir.
+    columns = list(df.columns)
+    c1, c2, c3, c4, c5 = st.columns([2, 3, 2, 1, 1])
+    search_col = c1.selectbox("Cari di Kolom", [ALL_COLUMNS] + columns, key=f"{key}_search_col")
+    query = c2.text_input("Kata Kunci", "", key=f"{key}_query").strip().lower()
+    sort_col = c3.selectbox("Urutkan", [NO_SORT] + columns, key=f"{key}_sort_col")
+    ascending = c4.selectbox("Arah", ["Naik", "Turun"], key=f"{key}_sort_dir") == "Naik"
+    size = c5.selectbox("Baris", PAGE_SIZES, index=PAGE_SIZES.index(page_size), key=f"{key}_page_size")
+
+    if sort_col == NO_SORT:
+        positions = np.arange(len(df))
+    else:
+        positions = memoize("grid_sort", (data_key, sort_col, ascending), lambda: _sort_order(df[sort_col], ascending))
+
+    match_key = f"{key}_match"
+    if query:
+        # Satu entri per tabel: kata kunci baru menimpa mask sebelumnya, bukan menumpuk
+        signature = (data_key, search_col, query)
+        cached = st.session_state.get(match_key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, _match_mask(df, search_col, query))
+            st.session_state[match_key] = cached
+        positions = positions[cached[1][positions]]
+    else:
+        st.session_state.pop(match_key, None)
+
+    total = len(positions)
+    n_pages = max(1, -(-total // size))
+    page_key = f"{key}_page"
+    # Jumlah halaman bisa menyusut setelah pencarian; nilai lama dijepit sebelum widget dibuat
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = st.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (int(page) - 1) * size
+    view = df.iloc[positions[start:start + size]]
+    st.dataframe(view, use_container_width=True)
+    if total:
+        st.caption(f"Menampilkan baris {start + 1:,}–{start + len(view):,} dari {total:,} (total data {len(df):,}).")
+    else:
+        st.caption(f"Tidak ada baris yang cocok dari {len(df):,} baris.")
+    return view
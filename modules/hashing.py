@@ -0,0 +1,29 @@
+import hashlib
+import streamlit as st
+
+# Jumlah digest unggahan yang diingat per sesi
+UPLOAD_DIGEST_MAX = 16
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def upload_digest(uploaded) -> str:
+    # SHA-1 atas seluruh isi unggahan cukup dihitung sekali per file_id (unik untuk setiap
+    # unggahan), bukan di setiap rerun
+    file_id = getattr(uploaded, "file_id", None)
+    if file_id is None:
+        return hash_bytes(uploaded.getvalue())
+    digests = st.session_state.setdefault("upload_digests", {})
+    if file_id not in digests:
+        if len(digests) >= UPLOAD_DIGEST_MAX:
+            digests.pop(next(iter(digests)))
+        digests[file_id] = hash_bytes(uploaded.getvalue())
+    return digests[file_id]
+
+
+def hash_filters(filters: dict) -> str:
+    # Kunci stabil untuk kombinasi filter (urutan kolom tidak berpengaruh)
+    items = sorted(((str(k), repr(v)) for k, v in filters.items()))
+    return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+import time
+
+DB_PATH = os.environ.get(
+    "ADUANPMT_HISTORY_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history.db"),
+)
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    template_name TEXT,
+    data_rows INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batches_user_created ON batches(username, created_at);
+
+CREATE TABLE IF NOT EXISTS letters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id INTEGER NOT NULL REFERENCES batches(id),
+    username TEXT NOT NULL,
+    name TEXT,
+    ok INTEGER NOT NULL,
+    status TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_letters_batch ON letters(batch_id, ok);
+CREATE INDEX IF NOT EXISTS idx_letters_user_id ON letters(username, id);
+CREATE INDEX IF NOT EXISTS idx_letters_created ON letters(created_at);
+
+-- Penghitung teragregasi per pengguna agar dashboard cukup membaca satu baris
+CREATE TABLE IF NOT EXISTS counters (
+    username TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    last_data_rows INTEGER NOT NULL DEFAULT 0,
+    last_activity REAL
+);
+"""
+
+
+def _connect(db_path: str = None) -> sqlite3.Connection:
+    # Satu koneksi per pemanggilan: aman dipakai dari thread sesi Streamlit mana pun
+    db_path = db_path or DB_PATH
+    if db_path not in _initialized:
+        with _init_lock:
+            if db_path not in _initialized:
+                if os.path.dirname(db_path):
+                    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                conn = sqlite3.connect(db_path)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                conn.close()
+                _initialized.add(db_path)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def is_success(status: str) -> bool:
+    return status.startswith("✅")
+
+
+def record_batch(username: str, log: list, template_name: str = None, data_rows: int = 0,
+                 db_path: str = None) -> int:
+    now = time.time()
+    rows = [(item["Nama"], int(is_success(item["Status"])), item["Status"]) for item in log]
+    success = sum(ok for _, ok, _ in rows)
+    failed = len(rows) - success
+
+    conn = _connect(db_path)
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO batches (username, template_name, data_rows, total, success, failed, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, template_name, data_rows, len(rows), success, failed, now),
+            )
+            batch_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO letters (batch_id, username, name, ok, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                ((batch_id, username, str(name), ok, status, now) for name, ok, status in rows),
+            )
+            conn.execute(
+                "INSERT INTO counters (username, total, success, failed, last_data_rows, last_activity) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET "
+                "total = total + excluded.total, success = success + excluded.success, "
+                "failed = failed + excluded.failed, last_data_rows = excluded.last_data_rows, "
+                "last_activity = excluded.last_activity",
+                (username, len(rows), success, failed, data_rows, now),
+            )
+    finally:
+        conn.close()
+    return batch_id
+
+
+def get_counters(username: str, db_path: str = None) -> dict:
+    conn = _connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT total, success, failed, last_data_rows FROM counters WHERE username = ?", (username,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return {"total": 0, "success": 0, "failed": 0, "last_data_rows": 0}
+    return dict(row)
+
+
+def recent_activity(username: str, limit: int = 5, db_path: str = None) -> list:
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT name, status FROM letters WHERE username = ? ORDER BY id DESC LIMIT ?", (username, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"Nama": r["name"], "Status": r["status"]} for r in rows]
+
@@ -0,0 +1,60 @@
+import streamlit as st
+from collections import OrderedDict
+
+from modules.session_resources import estimate_bytes
+
+# Batas jumlah hasil yang disimpan per sesi; entri terlama dibuang lebih dulu
+MEMO_MAX_ENTRIES = 64
+
+
+def lazy_tabs(labels: list, key: str, widgets: dict = None) -> str:
+    # st.tabs menjalankan semua isi tab di setiap rerun; radio horizontal
+    # hanya mengembalikan tab aktif sehingga hanya tab itu yang dihitung.
+    # widgets: {label tab: {key widget: pilihan yang sah atau None}} untuk widget di dalam tab.
+    active = st.radio("Tampilan", labels, horizontal=True, key=key, label_visibility="collapsed")
+    if widgets:
+        _keep_widget_state(widgets, active)
+    return active
+
+
+def _keep_widget_state(widgets: dict, active: str):
+    # Streamlit membuang nilai widget yang tidak dirender dalam satu run, jadi pengaturan di
+    # tab yang tersembunyi akan hilang. Nilainya ditulis ulang ke session_state (menjadi state
+    # biasa) agar tetap ada saat tab dibuka lagi. Nilai yang tidak lagi ada di pilihannya
+    # (data atau filter berganti) dibuang supaya widget kembali ke default.
+    # Key tombol tidak boleh didaftarkan: Streamlit menolak nilai tombol dari session_state.
+    for label, specs in widgets.items():
+        for widget_key, options in specs.items():
+            if widget_key not in st.session_state:
+                continue
+            value = st.session_state[widget_key]
+            values = value if isinstance(value, list) else [value]
+            if options is not None and not all(v in options for v in values):
+                del st.session_state[widget_key]
+            elif label != active:
+                st.session_state[widget_key] = value
+
+
+def memoize(namespace: str, key: tuple, compute):
+    # Ukuran tiap entri dihitung sekali saat disimpan; total berjalan di "memo_bytes"
+    # dipakai laporan memori sehingga tidak perlu mengukur ulang seluruh memo tiap rerun.
+    store = st.session_state.setdefault("memo_store", OrderedDict())
+    full_key = (namespace,) + tuple(key)
+    if full_key in store:
+        store.move_to_end(full_key)
+        return store[full_key][0]
+
+    value = compute()
+    nbytes = estimate_bytes(value)
+    store[full_key] = (value, nbytes)
+    total = st.session_state.get("memo_bytes", 0) + nbytes
+    while len(store) > MEMO_MAX_ENTRIES:
+        _, (_, dropped) = store.popitem(last=False)
+        total -= dropped
+    st.session_state["memo_bytes"] = total
+    return value
+
+
+def clear_memo():
+    st.session_state.pop("memo_store", None)
+    st.session_state.pop("memo_bytes", None)
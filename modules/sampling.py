@@ -0,0 +1,135 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+DEFAULT_SAMPLE_SIZE = 5000
+MIN_PER_STRATUM = 30
+# Kolom dengan nilai unik lebih banyak dari ini tidak ditawarkan untuk stratifikasi
+MAX_STRATA = 50
+Z_95 = 1.96
+
+
+class SampleResult:
+    def __init__(self, df: pd.DataFrame, population: int, strata_col: str | None = None,
+                 strata_sizes: pd.Series | None = None, sample_sizes: pd.Series | None = None):
+        self.df = df
+        self.population = population
+        self.strata_col = strata_col
+        self.strata_sizes = strata_sizes
+        self.sample_sizes = sample_sizes
+
+    @property
+    def is_sampled(self) -> bool:
+        return len(self.df) < self.population
+
+
+def reservoir_sample(df: pd.DataFrame, size: int, seed: int = 42) -> SampleResult:
+    # Untuk data di memori, reservoir sampling setara dengan memilih posisi
+    # acak tanpa pengembalian; cukup satu pemilihan indeks, bukan permutasi penuh.
+    if len(df) <= size:
+        return SampleResult(df, len(df))
+    rng = np.random.default_rng(seed)
+    positions = np.sort(rng.choice(len(df), size=size, replace=False))
+    return SampleResult(df.iloc[positions], len(df))
+
+
+def _strata_labels(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), "<NA>").astype(str)
+
+
+def _allocate(strata_sizes: pd.Series, size: int) -> pd.Series:
+    # Jatah minimum per strata agar kategori kecil tetap terwakili, dibatasi size // jumlah
+    # strata supaya total tidak melebihi size; sisanya dibagi proporsional terhadap kapasitas
+    # tersisa (metode sisa terbesar), sehingga total tepat min(size, populasi).
+    sizes = strata_sizes.to_numpy()
+    floor = min(MIN_PER_STRATUM, size // len(sizes))
+    base = np.minimum(sizes, floor)
+    capacity = sizes - base
+    remaining = min(size - int(base.sum()), int(capacity.sum()))
+    if remaining <= 0:
+        return pd.Series(base, index=strata_sizes.index).astype(int)
+
+    quota = remaining * capacity / capacity.sum()
+    extra = np.floor(quota).astype(int)
+    leftover = remaining - int(extra.sum())
+    if leftover:
+        extra[np.argsort(-(quota - extra), kind="stable")[:leftover]] += 1
+    return pd.Series(np.minimum(base + extra, sizes), index=strata_sizes.index).astype(int)
+
+
+def stratified_sample(df: pd.DataFrame, size: int, strata_col: str, seed: int = 42) -> SampleResult:
+    if len(df) <= size:
+        return SampleResult(df, len(df))
+
+    strata = _strata_labels(df[strata_col])
+    codes, uniques = pd.factorize(strata)
+    strata_sizes = pd.Series(np.bincount(codes, minlength=len(uniques)), index=uniques)
+    sample_sizes = _allocate(strata_sizes, size)
+
+    rng = np.random.default_rng(seed)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(strata_sizes.to_numpy())])
+    picked = [
+        rng.choice(order[bounds[h]:bounds[h + 1]], size=int(n_h), replace=False)
+        for h, n_h in enumerate(sample_sizes.to_numpy())
+    ]
+    positions = np.sort(np.concatenate(picked))
+    return SampleResult(df.iloc[positions], len(df), strata_col, strata_sizes, sample_sizes)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_sample(dataset_key: str, filter_key: str, size: int, strata_col: str | None,
+                  _df: pd.DataFrame, seed: int = 42) -> SampleResult:
+    if strata_col:
+        return stratified_sample(_df, size, strata_col, seed)
+    return reservoir_sample(_df, size, seed)
+
+
+def error_bounds(sample: SampleResult, cols: list) -> pd.DataFrame:
+    # Estimasi mean dengan selang kepercayaan 95% (dengan koreksi populasi hingga).
+    # Untuk sampel berstrata, mean dan varians dihitung terbobot per strata.
+    records = []
+    for col in cols:
+        values = pd.to_numeric(sample.df[col], errors="coerce")
+        note = ""
+        if sample.strata_col is None:
+            data = values.dropna()
+            n, N = len(data), sample.population
+            mean = data.mean()
+            se = data.std(ddof=1) / np.sqrt(n) * np.sqrt(max(1 - n / N, 0)) if n > 1 else np.nan
+        else:
+            strata = _strata_labels(sample.df[sample.strata_col])
+            grouped = values.groupby(strata)
+            N_h = sample.strata_sizes.astype(float)
+            n_h = grouped.count().reindex(N_h.index, fill_value=0)
+            W_h = N_h / N_h.sum()
+            fpc = (1 - n_h / N_h).clip(lower=0)
+            observed = n_h > 0
+            mean = float((W_h[observed] * grouped.mean().reindex(N_h.index)[observed]).sum() / W_h[observed].sum())
+
+            # Strata dengan < 2 nilai (dan bukan sensus penuh) tidak punya perkiraan varians;
+            # dilewati dari ± dan ditandai, bukan dianggap bervariansi nol
+            contrib = W_h ** 2 * grouped.var(ddof=1).reindex(N_h.index) / n_h.replace(0, np.nan) * fpc
+            contrib[fpc == 0] = 0.0
+            unknown = int(contrib.isna().sum())
+            se = float(np.sqrt(contrib.sum()))
+            n = int(n_h.sum())
+            if unknown:
+                note = f"{unknown} strata dengan < 2 nilai: ± terlalu kecil"
+
+        records.append({
+            "Kolom": col,
+            "n Sampel": n,
+            "Mean (perkiraan)": mean,
+            "± 95%": Z_95 * se,
+            "Catatan": note,
+        })
+    return pd.DataFrame(records)
+
+
+def proportion_margin(sample: SampleResult) -> float:
+    # Margin error terburuk (p = 0.5) untuk proporsi kategori dari sampel acak
+    n, N = len(sample.df), sample.population
+    if n == 0:
+        return np.nan
+    return Z_95 * np.sqrt(0.25 / n) * np.sqrt(max(1 - n / N, 0))
@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+
+MEMORY_BUDGET_MB = int(os.environ.get("ADUANPMT_MEMORY_BUDGET_MB", "1024"))
+
+
+def estimate_bytes(obj, _depth: int = 0) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if _depth < 3 and isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_bytes(v, _depth + 1) for v in obj.values())
+    if _depth < 3 and isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_bytes(v, _depth + 1) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class SharedObjectStore:
+    # Objek besar disimpan sekali per kunci konten; setiap sesi hanya memegang referensi.
+    # Jika total melebihi anggaran, entri tanpa pemakai dibuang lebih dulu (LRU),
+    # lalu entri yang masih dipakai (sesi terkait akan memuat ulang saat dibutuhkan).
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+    def get(self, key: str, session_id: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry["refs"].add(session_id)
+            return entry["obj"]
+
+    def put(self, key: str, obj, session_id: str, nbytes: int = None):
+        nbytes = estimate_bytes(obj) if nbytes is None else nbytes
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"obj": obj, "nbytes": nbytes, "refs": set()}
+                self._entries[key] = entry
+                self.total_bytes += nbytes
+            self._entries.move_to_end(key)
+            entry["refs"].add(session_id)
+            self._evict(protect=key)
+        return entry["obj"]
+
+    def unref(self, key: str, session_id: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["refs"].discard(session_id)
+
+    def release(self, session_id: str):
+        with self._lock:
+            for key in list(self._entries):
+                entry = self._entries[key]
+                entry["refs"].discard(session_id)
+                if not entry["refs"]:
+                    self._drop(key)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry["nbytes"]
+
+    def _evict(self, protect: str):
+        for only_unused in (True, False):
+            for key in list(self._entries):
+                if self.total_bytes <= self.budget_bytes:
+                    return
+                if key == protect or (only_unused and self._entries[key]["refs"]):
+                    continue
+                self._drop(key)
+
+    def session_bytes(self, session_id: str) -> int:
+        with self._lock:
+            return sum(e["nbytes"] for e in self._entries.values() if session_id in e["refs"])
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = set().union(*(e["refs"] for e in self._entries.values())) if self._entries else set()
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "sessions": len(sessions),
+            }
+
+
+@st.cache_resource
+def get_store() -> SharedObjectStore:
+    # Satu store per proses, dipakai bersama oleh semua sesi
+    return SharedObjectStore(MEMORY_BUDGET_MB * 1024 * 1024)
+
+
+def session_id() -> str:
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+
+def shared_object(name: str, key: str, loader):
+    # Objek bersama bersifat read-only: jangan diubah in-place oleh pemanggil
+    store = get_store()
+    sid = session_id()
+    handles = st.session_state.setdefault("resource_handles", {})
+
+    previous = handles.get(name)
+    if previous is not None and previous != key and previous not in [k for n, k in handles.items() if n != name]:
+        store.unref(previous, sid)
+
+    obj = store.get(key, sid)
+    if obj is None:
+        obj = store.put(key, loader(), sid)
+    handles[name] = key
+    return obj
+
+
+def session_memory_report() -> dict:
+    store = get_store()
+    sid = session_id()
+    return {
+        "session_bytes": store.session_bytes(sid),
+        # Total berjalan dari memoize(); mengukur memo di sini akan mahal di setiap rerun
+        "memo_bytes": st.session_state.get("memo_bytes", 0),
+        **store.stats(),
+    }
+
+
+def release_session():
+    # Dipanggil saat logout / timeout agar referensi sesi ini segera dilepas
+    if "session_id" in st.session_state:
+        get_store().release(st.session_state.session_id)
+    st.session_state.pop("resource_handles", None)
+    st.session_state.pop("memo_store", None)
+    st.session_state.pop("memo_bytes", None)
@@ -0,0 +1,303 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+CHUNK_ROWS = 100_000
+SKETCH_K = 256
+HLL_PRECISION = 12
+TOP_K = 50
+
+
+class QuantileSketch:
+    # Sketch kuantil bergaya KLL: setiap level menyimpan paling banyak k item,
+    # item di level h mewakili 2^h nilai asli. Ukuran memori ~ k * log2(n / k).
+    def __init__(self, k: int = SKETCH_K, seed: int = 0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        for h, level in enumerate(other.levels):
+            if h < len(self.levels):
+                self.levels[h] = np.concatenate([self.levels[h], level])
+            else:
+                self.levels.append(level.copy())
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if level.size > self.k:
+                level = np.sort(level)
+                keep = level[-1:] if level.size % 2 else level[:0]
+                if level.size % 2:
+                    level = level[:-1]
+                promoted = level[self._rng.integers(2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(promoted)
+                else:
+                    self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        items, weights = self.weighted_items()
+        if items.size == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        cum = np.cumsum(weights)
+        idx = np.searchsorted(cum, np.asarray(q) * cum[-1], side="left")
+        return items[np.clip(idx, 0, items.size - 1)]
+
+    def histogram(self, bins: int):
+        items, weights = self.weighted_items()
+        return np.histogram(items, bins=bins, weights=weights)
+
+
+class HyperLogLog:
+    # Perkiraan jumlah nilai unik dengan 2^p register (error standar ~1.04/sqrt(2^p))
+    def __init__(self, p: int = HLL_PRECISION):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_array(np.asarray(values))
+        width = 64 - self.p
+        idx = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+
+        bit_len = np.zeros(rest.shape, dtype=np.int64)
+        nonzero = rest > 0
+        bit_len[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (width - bit_len + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if est <= 2.5 * m and zeros:
+            # Koreksi rentang kecil (linear counting)
+            est = m * np.log(m / zeros)
+        return int(round(est))
+
+
+class HeavyHitters:
+    # Ringkasan Misra-Gries: hitungan adalah batas bawah, kesalahan <= error
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.counts = {}
+        self.error = 0
+
+    def update(self, values: pd.Series):
+        counts = values.value_counts(dropna=True)
+        if len(counts) > self.k:
+            # Ringkas chunk lebih dulu agar penggabungan tetap O(k)
+            cut = int(counts.iloc[self.k])
+            self.error += cut
+            counts = counts[counts > cut] - cut
+        for value, count in counts.items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        self._trim()
+
+    def merge(self, other: "HeavyHitters"):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.error += other.error
+        self._trim()
+
+    def _trim(self):
+        if len(self.counts) <= self.k:
+            return
+        cut = sorted(self.counts.values(), reverse=True)[self.k]
+        self.error += cut
+        self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def top(self, n: int):
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+class ColumnState:
+    kind = "Kategorikal"
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.top = HeavyHitters()
+
+    def update(self, series: pd.Series):
+        mask = series.isna().to_numpy()
+        self.nulls += int(mask.sum())
+        values = series[~mask]
+        self.count += len(values)
+        self.distinct.update(values.astype(str).to_numpy())
+        self.top.update(values)
+
+    def merge(self, other: "ColumnState"):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+
+class NumericState(ColumnState):
+    kind = "Numerik"
+
+    def __init__(self):
+        super().__init__()
+        self.min = np.inf
+        self.max = -np.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quantiles = QuantileSketch()
+
+    def update(self, series: pd.Series) -> bool:
+        # Tipe kolom ditebak dari chunk pertama; jika chunk ini berisi teks yang tidak bisa
+        # diubah ke angka, state tidak diubah dan False dikembalikan (lihat to_categorical)
+        numeric = pd.to_numeric(series, errors="coerce")
+        if (numeric.isna() & series.notna()).any():
+            return False
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = np.isnan(values)
+        self.nulls += int(mask.sum())
+        values = values[~mask]
+        if values.size == 0:
+            return True
+
+        chunk_mean = values.mean()
+        self._merge_moments(values.size, chunk_mean, float(((values - chunk_mean) ** 2).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.quantiles.update(values)
+        self.distinct.update(values)
+        self.top.update(pd.Series(values))
+        return True
+
+    def to_categorical(self) -> ColumnState:
+        # Hitungan dan sketsa yang sudah terkumpul dibawa; nilai numerik sebelumnya tetap
+        # tercatat sebagai angka di sketsa unik/top (perkiraan)
+        state = ColumnState()
+        state.count = self.count
+        state.nulls = self.nulls
+        state.distinct = self.distinct
+        state.top = self.top
+        return state
+
+    def _merge_moments(self, n_b: int, mean_b: float, m2_b: float):
+        # Penggabungan Welford paralel (Chan et al.)
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+
+    def merge(self, other: "NumericState"):
+        if other.count:
+            self._merge_moments(other.count, other.mean, other.m2)
+        self.nulls += other.nulls
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+
+class StreamSummary:
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            state = self.columns.get(col)
+            if state is None:
+                is_num = pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+                state = NumericState() if is_num else ColumnState()
+                # Kolom yang baru muncul: baris sebelumnya dihitung sebagai kosong
+                state.nulls += self.rows - len(chunk)
+                self.columns[col] = state
+            if state.update(chunk[col]) is False:
+                # Kolom yang awalnya kosong/tampak numerik ternyata berisi teks
+                state = state.to_categorical()
+                self.columns[col] = state
+                state.update(chunk[col])
+
+    def merge(self, other: "StreamSummary"):
+        for col, state in other.columns.items():
+            if col in self.columns:
+                mine = self.columns[col]
+                if isinstance(mine, NumericState) and not isinstance(state, NumericState):
+                    mine = self.columns[col] = mine.to_categorical()
+                elif isinstance(state, NumericState) and not isinstance(mine, NumericState):
+                    state = state.to_categorical()
+                mine.merge(state)
+            else:
+                state.nulls += self.rows
+                self.columns[col] = state
+        self.rows += other.rows
+
+    def numeric_columns(self) -> list:
+        return [c for c, s in self.columns.items() if isinstance(s, NumericState)]
+
+    def categorical_columns(self) -> list:
+        return [c for c, s in self.columns.items() if not isinstance(s, NumericState)]
+
+    def overview(self) -> pd.DataFrame:
+        records = []
+        for col, state in self.columns.items():
+            is_num = isinstance(state, NumericState) and state.count > 0
+            records.append({
+                "Kolom": col,
+                "Tipe": state.kind,
+                "Count": state.count,
+                "Missing Count": state.nulls,
+                "Missing (%)": round(state.nulls / self.rows * 100, 2) if self.rows else 0.0,
+                "Unik (perkiraan)": state.distinct.estimate(),
+                "Min": state.min if is_num else None,
+                "Max": state.max if is_num else None,
+                "Mean": state.mean if is_num else None,
+                "Std": float(np.sqrt(state.variance)) if is_num else None,
+            })
+        return pd.DataFrame(records)
+
+
+def summarize_csv(source, chunksize: int = CHUNK_ROWS, filters: dict | None = None) -> StreamSummary:
+    summary = StreamSummary()
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        for col, vals in (filters or {}).items():
+            chunk = chunk[chunk[col].isin(vals)]
+        summary.update(chunk)
+    return summary
+
+
+# Catatan: sumber dari st.file_uploader sudah utuh di memori server (batas ukurannya
+# mengikuti server.maxUploadSize). Yang dibatasi mode streaming adalah memori untuk
+# parsing dan statistik, bukan salinan file unggahan itu sendiri.
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_summary(dataset_key: str, filter_key: str, _source, _filters: dict) -> StreamSummary:
+    if hasattr(_source, "seek"):
+        _source.seek(0)
+    return summarize_csv(_source, filters=_filters)
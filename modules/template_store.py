@@ -0,0 +1,30 @@
+import json
+import os
+
+# Metadata pustaka template yang hanya menyentuh filesystem; dipisah dari
+# modules.templates agar halaman seperti dashboard tidak ikut mengimpor
+# python-docx, docxtpl dan Jinja hanya untuk menghitung template.
+TEMPLATE_DIR = os.environ.get(
+    "ADUANPMT_TEMPLATE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "templates"),
+)
+
+
+def list_templates(directory: str = TEMPLATE_DIR) -> list:
+    if not os.path.isdir(directory):
+        return []
+    items = []
+    for fname in os.listdir(directory):
+        if not fname.endswith(".json"):
+            continue
+        with open(os.path.join(directory, fname), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        meta["digest"] = fname[:-len(".json")]
+        items.append(meta)
+    return sorted(items, key=lambda m: m["added_at"], reverse=True)
+
+
+def count_templates(directory: str = TEMPLATE_DIR) -> int:
+    if not os.path.isdir(directory):
+        return 0
+    return sum(1 for fname in os.listdir(directory) if fname.endswith(".json"))
@@ -0,0 +1,149 @@
+import streamlit as st
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from io import BytesIO
+from docx import Document
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+from modules.utils import set_paragraph_style
+from modules.template_store import TEMPLATE_DIR, count_templates, list_templates
+
+
+class _CachingEnvironment(Environment):
+    # docxtpl memanggil from_string untuk body, header, footer dan properti di setiap
+    # render; hasil kompilasi Jinja (AST -> kode Python) disimpan per teks sumber.
+    def __init__(self):
+        super().__init__()
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def from_string(self, source, globals=None, template_class=None):
+        template = self._compiled.get(source)
+        if template is None:
+            template = super().from_string(source, globals=globals, template_class=template_class)
+            with self._lock:
+                self._compiled[source] = template
+        return template
+
+
+class _PrecompiledDocxTemplate(DocxTemplate):
+    def __init__(self, compiled: "CompiledTemplate"):
+        super().__init__(BytesIO(compiled.blob))
+        self._compiled = compiled
+
+    def build_xml(self, context, jinja_env=None):
+        # Body XML yang sudah di-patch dipakai ulang; tidak perlu serialisasi + regex lagi
+        return self.render_xml_part(self._compiled.body_xml, self.docx._part, context, jinja_env)
+
+    def patch_xml(self, src_xml):
+        return self._compiled.patch_xml(src_xml)
+
+
+class CompiledTemplate:
+    def __init__(self, blob: bytes, name: str = "template.docx"):
+        self.name = name
+        self.digest = hashlib.sha256(blob).hexdigest()
+
+        # Penyesuaian gaya (Arial 12, rata kiri-kanan) diterapkan sekali pada template,
+        # sehingga setiap surat hasil render sudah mewarisinya.
+        doc = Document(BytesIO(blob))
+        set_paragraph_style(doc)
+        buf = BytesIO()
+        doc.save(buf)
+        self.blob = buf.getvalue()
+
+        self.jinja_env = _CachingEnvironment()
+        self._patched = {}
+        self._lock = threading.Lock()
+
+        self._probe = DocxTemplate(BytesIO(self.blob))
+        self._probe.init_docx()
+        self.body_xml = self.patch_xml(self._probe.get_xml())
+        # Kompilasi awal body dengan transformasi yang sama seperti render_xml_part
+        self.jinja_env.from_string(re.sub(r"<w:p([ >])", r"\n<w:p\1", self.body_xml))
+
+    def patch_xml(self, src_xml: str) -> str:
+        patched = self._patched.get(src_xml)
+        if patched is None:
+            patched = DocxTemplate.patch_xml(self._probe, src_xml)
+            with self._lock:
+                self._patched[src_xml] = patched
+        return patched
+
+    def render(self, context: dict):
+        # Mengembalikan dokumen python-docx yang sudah dirender (tanpa simpan/parse ulang)
+        tpl = _PrecompiledDocxTemplate(self)
+        tpl.render(context, jinja_env=self.jinja_env)
+        return tpl.docx
+
+
+def _write_atomic(path: str, data: bytes):
+    # Sesi adalah thread dalam satu proses: tiap penulis memakai file sementara unik,
+    # lalu diganti secara atomik. Kalah balapan tidak masalah karena isinya identik.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            if not os.path.exists(path):
+                raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class TemplateRegistry:
+    def __init__(self, directory: str = TEMPLATE_DIR):
+        self.directory = directory
+        self._compiled = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{digest}.{ext}")
+
+    def add(self, blob: bytes, name: str) -> str:
+        digest = hashlib.sha256(blob).hexdigest()
+        if not os.path.exists(self._path(digest, "docx")):
+            # Validasi dengan kompilasi sebelum disimpan ke pustaka
+            compiled = CompiledTemplate(blob, name)
+            _write_atomic(self._path(digest, "docx"), blob)
+            # Metadata ditulis terakhir: list() hanya membaca .json yang sudah utuh
+            meta = {"name": name, "size": len(blob), "added_at": time.time()}
+            _write_atomic(self._path(digest, "json"), json.dumps(meta).encode("utf-8"))
+            with self._lock:
+                self._compiled.setdefault(digest, compiled)
+        return digest
+
+    def list(self) -> list:
+        return list_templates(self.directory)
+
+    def count(self) -> int:
+        return count_templates(self.directory)
+
+    def get(self, digest: str) -> CompiledTemplate:
+        compiled = self._compiled.get(digest)
+        if compiled is None:
+            with open(self._path(digest, "docx"), "rb") as fh:
+                blob = fh.read()
+            name = digest
+            if os.path.exists(self._path(digest, "json")):
+                with open(self._path(digest, "json"), encoding="utf-8") as fh:
+                    name = json.load(fh)["name"]
+            compiled = CompiledTemplate(blob, name)
+            with self._lock:
+                compiled = self._compiled.setdefault(digest, compiled)
+        return compiled
+
+
+@st.cache_resource
+def get_registry() -> TemplateRegistry:
+    # Satu registry per proses, dipakai bersama oleh semua sesi
+    return TemplateRegistry()
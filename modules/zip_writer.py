@@ -0,0 +1,132 @@
+import struct
+import threading
+import time
+import warnings
+import zlib
+
+# Penulis ZIP kecil untuk entri yang sudah dikompresi (raw deflate) di thread lain.
+# zipfile tidak punya API publik untuk data terkompresi, jadi struktur arsip ditulis
+# langsung mengikuti APPNOTE: header lokal + data per entri, lalu central directory
+# dan end record (dengan record ZIP64 bila ukuran, offset atau jumlah entri melewati batas).
+
+ZIP64_LIMIT = (1 << 32) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP_DEFLATED = 8
+
+_LOCAL_HEADER = "<IHHHHHIIIHH"
+_CENTRAL_HEADER = "<IBBBBHHHHIIIHHHHHII"
+_END_RECORD = "<IHHHHIIH"
+_END_RECORD64 = "<IQHHIIQQQQ"
+_END_LOCATOR64 = "<IIQI"
+
+_VERSION_DEFLATED = 20
+_VERSION_ZIP64 = 45
+_CREATE_SYSTEM_UNIX = 3
+_FLAG_UTF8 = 0x800
+_EXTERNAL_ATTR = 0o600 << 16
+
+
+def deflate(data: bytes, level: int) -> tuple:
+    # Dijalankan di thread pekerja (zlib melepas GIL); hasilnya untuk write_deflated
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return len(data), zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+
+def _encode_name(name: str) -> tuple:
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), _FLAG_UTF8
+
+
+def _dos_datetime(tm) -> tuple:
+    dos_time = (tm.tm_hour << 11) | (tm.tm_min << 5) | (tm.tm_sec // 2)
+    dos_date = ((tm.tm_year - 1980) << 9) | (tm.tm_mon << 5) | tm.tm_mday
+    return dos_time, dos_date
+
+
+def _zip64_extra(fields: list) -> bytes:
+    if not fields:
+        return b""
+    return struct.pack(f"<HH{len(fields)}Q", 0x0001, 8 * len(fields), *fields)
+
+
+class PrecompressedZipWriter:
+    def __init__(self, fp):
+        self.fp = fp
+        self._entries = []
+        self._names = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_deflated(self, name: str, file_size: int, crc: int, payload: bytes):
+        name_bytes, flags = _encode_name(name)
+        dos_time, dos_date = _dos_datetime(time.localtime())
+        compress_size = len(payload)
+        zip64 = file_size >= ZIP64_LIMIT or compress_size >= ZIP64_LIMIT
+        extra = _zip64_extra([file_size, compress_size] if zip64 else [])
+        version = _VERSION_ZIP64 if zip64 else _VERSION_DEFLATED
+        with self._lock:
+            if self._closed:
+                raise ValueError("Arsip ZIP sudah ditutup")
+            if name in self._names:
+                # Sama seperti zipfile: diperbolehkan, tetapi diberi peringatan
+                warnings.warn(f"Duplicate name: {name!r}", stacklevel=2)
+            self._names.add(name)
+            offset = self.fp.tell()
+            self.fp.write(struct.pack(
+                _LOCAL_HEADER, 0x04034B50, version, flags, ZIP_DEFLATED, dos_time, dos_date, crc,
+                ZIP64_LIMIT if zip64 else compress_size, ZIP64_LIMIT if zip64 else file_size,
+                len(name_bytes), len(extra),
+            ))
+            self.fp.write(name_bytes)
+            self.fp.write(extra)
+            self.fp.write(payload)
+            self._entries.append((name_bytes, flags, dos_time, dos_date, crc, compress_size, file_size, offset))
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            start = self.fp.tell()
+            for name_bytes, flags, dos_time, dos_date, crc, compress_size, file_size, offset in self._entries:
+                # Di central directory hanya nilai yang melewati batas yang dipindah ke extra ZIP64
+                fields = []
+                if file_size >= ZIP64_LIMIT:
+                    fields.append(file_size)
+                    file_size = ZIP64_LIMIT
+                if compress_size >= ZIP64_LIMIT:
+                    fields.append(compress_size)
+                    compress_size = ZIP64_LIMIT
+                if offset >= ZIP64_LIMIT:
+                    fields.append(offset)
+                    offset = ZIP64_LIMIT
+                extra = _zip64_extra(fields)
+                version = _VERSION_ZIP64 if fields else _VERSION_DEFLATED
+                self.fp.write(struct.pack(
+                    _CENTRAL_HEADER, 0x02014B50, version, _CREATE_SYSTEM_UNIX, version, 0, flags, ZIP_DEFLATED,
+                    dos_time, dos_date, crc, compress_size, file_size, len(name_bytes), len(extra), 0, 0, 0,
+                    _EXTERNAL_ATTR, offset,
+                ))
+                self.fp.write(name_bytes)
+                self.fp.write(extra)
+
+            count = len(self._entries)
+            size = self.fp.tell() - start
+            if count > ZIP_FILECOUNT_LIMIT or size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+                end64 = self.fp.tell()
+                self.fp.write(struct.pack(
+                    _END_RECORD64, 0x06064B50, 44, _VERSION_ZIP64, _VERSION_ZIP64, 0, 0, count, count, size, start,
+                ))
+                self.fp.write(struct.pack(_END_LOCATOR64, 0x07064B50, 0, end64, 1))
+                count = min(count, ZIP_FILECOUNT_LIMIT)
+                size = min(size, ZIP64_LIMIT)
+                start = min(start, ZIP64_LIMIT)
+            self.fp.write(struct.pack(_END_RECORD, 0x06054B50, 0, 0, count, count, size, start, 0))